@@ -1,14 +1,23 @@
+import heapq
 import sys
-from itertools import combinations
+import time
+from array import array
+from itertools import combinations, islice
 from math import gcd
 
-def parse_input(raw, k):
-    subsets = []
-    for line in raw.strip().splitlines():
-        nums = tuple(sorted(int(x) for x in line.strip().split()))
-        if len(nums) == k:
-            subsets.append(nums)
-    return subsets
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from swsc import kernels
+from swsc.collectionFile import isCollectionFile, iterCollectionFile, readCollection, readHeader
+
+# Malformed lines are reported on stderr (see report_malformed) and skipped
+def parse_input(raw, k, n=None):
+    subsets, malformed = read_subsets(raw.strip().splitlines(), k, n)
+    report_malformed(malformed)
+    return list(subsets)
 
 def between(x, y, z):
     return (x < y < z) or (z < x < y) or (y < z < x)
@@ -33,6 +42,41 @@ def weakly_separated_correct(A, B, n):
                         return False
     return True
 
+# Encode a subset of {1..n} as an integer with bit x-1 set for each element x
+def subset_to_mask(subset):
+    mask = 0
+    for x in subset:
+        mask |= 1 << (x - 1)
+    return mask
+
+def mask_to_subset(mask):
+    subset = []
+    x = 1
+    while mask:
+        if mask & 1:
+            subset.append(x)
+        mask >>= 1
+        x += 1
+    return tuple(subset)
+
+# Mask of every bit from the lowest to the highest set bit of x
+def _span(x):
+    return (1 << x.bit_length()) - (x & -x)
+
+# A and B are weakly separated iff, reading A\B and B\A around the circle, the
+# labels form at most two runs. Cut at 1 that is A*B*A* or B*A*B*, i.e. one side
+# has no element strictly inside the span of the other side.
+def weakly_separated_masks(a, b):
+    a_only = a & ~b
+    b_only = b & ~a
+    if not a_only or not b_only:
+        return True
+    return not (a_only & _span(b_only)) or not (b_only & _span(a_only))
+
+def weakly_separated(A, B, n):
+    return weakly_separated_masks(subset_to_mask(A), subset_to_mask(B))
+
+
 def add_mod(subset, l, n):
     return tuple(sorted((x + l - 1) % n + 1 for x in subset))
 
@@ -50,18 +94,39 @@ def orbit(subset, l, n):
     return result
 
 def is_weakly_separated_all(collection, n):
-    for i in range(len(collection)):
-        for j in range(i + 1, len(collection)):
-            if not weakly_separated_correct(collection[i], collection[j], n):
+    masks = [subset_to_mask(sub) for sub in collection]
+    for i in range(len(masks)):
+        for j in range(i + 1, len(masks)):
+            if not weakly_separated_masks(masks[i], masks[j]):
+                return False
+    return True
+
+# Does every member of new_masks separate from every member of base_masks and from each other?
+def _extends_weakly_separated(base_masks, new_masks):
+    for i, c in enumerate(new_masks):
+        for m in base_masks:
+            if not weakly_separated_masks(c, m):
+                return False
+        for j in range(i + 1, len(new_masks)):
+            if not weakly_separated_masks(c, new_masks[j]):
                 return False
     return True
 
-def possible_orbit_extensions(current_collection, n, k, l):
+# With incremental=True the current collection is checked once (skipped if
+# assume_separated) and each candidate orbit is then only checked against it and
+# against itself. incremental=False re-checks the whole extended collection.
+def possible_orbit_extensions(current_collection, n, k, l, incremental=True, assume_separated=False):
     all_subsets = list(combinations(range(1, n + 1), k))
     used_orbits = {frozenset(orbit(sub, l, n)) for sub in current_collection}
     current_set = list(current_collection)
     max_size = k * (n - k) + 1
 
+    if incremental:
+        current_masks = [subset_to_mask(sub) for sub in current_set]
+        if not assume_separated and not is_weakly_separated_all(current_set, n):
+            return []
+        verdicts = {}
+
     valid_extensions = []
     for candidate in all_subsets:
         candidate_orbit = orbit(candidate, l, n)
@@ -70,43 +135,761 @@ def possible_orbit_extensions(current_collection, n, k, l):
         if frozen_candidate_orbit in used_orbits:
             continue
 
-        extended_collection = current_set + list(frozen_candidate_orbit)
-
-        if len(extended_collection) > max_size:
+        if len(current_set) + len(frozen_candidate_orbit) > max_size:
             continue
 
-        if is_weakly_separated_all(extended_collection, n):
+        if incremental:
+            if frozen_candidate_orbit not in verdicts:
+                orbit_masks = [subset_to_mask(sub) for sub in frozen_candidate_orbit]
+                verdicts[frozen_candidate_orbit] = _extends_weakly_separated(current_masks, orbit_masks)
+            if verdicts[frozen_candidate_orbit]:
+                valid_extensions.append(candidate_orbit)
+        elif is_weakly_separated_all(current_set + list(frozen_candidate_orbit), n):
             valid_extensions.append(candidate_orbit)
 
     return valid_extensions
 
-def find_non_weakly_separated(subsets, n):
+# ───────────────────────
+# Branch-and-bound completion
+# ───────────────────────
+# Completes a partial l-symmetric collection to k(n-k)+1 subsets by adding whole orbits
+# of x -> x+l. Every orbit is enumerated once. An orbit stays a candidate only if it is
+# weakly separated from the collection and from itself. Two candidates are compatible if
+# every member of one is weakly separated from every member of the other. By symmetry,
+# one member of the first against all of the second is enough.
+#
+# The search adds candidates in index order. After each one it keeps only the candidates
+# compatible with everything chosen so far (one AND of bitsets). A branch is dropped when
+# even all of its remaining candidates could not reach the target size.
+#
+# The result's status is:
+#   "complete"  collection is a completion
+#   "none"      the search finished, so no completion exists
+#   "budget"    the node or time budget ran out first
+#   "invalid"   the starting collection is not weakly separated
+class _BudgetSpent(Exception):
+    pass
+
+def complete_symmetric_collection(current_collection, n, k, l, max_nodes=None, max_seconds=None):
+    start = time.perf_counter()
+    current = list(dict.fromkeys(tuple(sorted(sub)) for sub in current_collection))
+    target = k * (n - k) + 1
+    result = {"status": None, "collection": None, "added_orbits": [], "candidates": 0, "nodes": 0,
+              "elapsed_seconds": 0.0}
+
+    def finish(status, added=()):
+        result["status"] = status
+        result["added_orbits"] = [candidates[c] for c in added]
+        if status == "complete":
+            result["collection"] = sorted(current + [sub for c in added for sub in candidates[c]])
+        result["elapsed_seconds"] = time.perf_counter() - start
+        return result
+
+    candidates = []
+    if not is_weakly_separated_all(current, n):
+        return finish("invalid")
+    if len(current) == target:
+        return finish("complete")
+
+    # Candidate orbits: not already used, separated from the collection and from themselves
+    current_masks = [subset_to_mask(sub) for sub in current]
+    current_set = set(current)
+    seen = set()
+    for subset in combinations(range(1, n + 1), k):
+        if subset in seen or subset in current_set:
+            continue
+        members = orbit(subset, l, n)
+        seen.update(members)
+        if any(member in current_set for member in members) or len(current) + len(members) > target:
+            continue
+        if _extends_weakly_separated(current_masks, [subset_to_mask(sub) for sub in members]):
+            candidates.append(members)
+    result["candidates"] = len(candidates)
+
+    # compatible[i]: bitset of candidates that can sit next to candidate i
+    member_masks = [[subset_to_mask(sub) for sub in members] for members in candidates]
+    compatible = [0] * len(candidates)
+    for i in range(len(candidates)):
+        rep = member_masks[i][0]
+        for j in range(i + 1, len(candidates)):
+            if all(weakly_separated_masks(rep, m) for m in member_masks[j]):
+                compatible[i] |= 1 << j
+                compatible[j] |= 1 << i
+
+    # Candidates grouped by orbit size, so the size of any candidate set is a few popcounts
+    by_size = {}
+    for i, members in enumerate(candidates):
+        by_size[len(members)] = by_size.get(len(members), 0) | (1 << i)
+
+    def reachable(avail):
+        return sum(size * bin(avail & group).count("1") for size, group in by_size.items())
+
+    chosen = []
+    nodes = 0
+
+    def search(size, avail):
+        # True when a completion is in chosen; raises _BudgetSpent when the budget is gone
+        nonlocal nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise _BudgetSpent
+        if max_seconds is not None and nodes % 1024 == 0 and time.perf_counter() - start > max_seconds:
+            raise _BudgetSpent
+        if size == target:
+            return True
+        if size + reachable(avail) < target:
+            return False
+        while avail:
+            low = avail & -avail
+            i = low.bit_length() - 1
+            avail ^= low
+            if size + len(candidates[i]) > target:
+                continue
+            chosen.append(i)
+            if search(size + len(candidates[i]), avail & compatible[i]):
+                return True
+            chosen.pop()
+            if size + reachable(avail) < target:    # Without i, the rest can no longer reach the target
+                return False
+        return False
+
+    try:
+        found = search(len(current), (1 << len(candidates)) - 1)
+    except _BudgetSpent:
+        result["nodes"] = nodes
+        return finish("budget")
+    result["nodes"] = nodes
+    return finish("complete", chosen) if found else finish("none")
+
+# Every pair (i, j), i < j, that is not weakly separated, in order, one at a time
+def iter_non_weakly_separated(subsets, n):
+    masks = [subset_to_mask(sub) for sub in subsets]
+    if n <= 64 and kernels.compiled():
+        yield from kernels.iterConflictPairs(masks)
+        return
+    for i in range(len(masks)):
+        a = masks[i]
+        for j in range(i + 1, len(masks)):
+            if not weakly_separated_masks(a, masks[j]):
+                yield i, j
+
+# With limit, stops after the first limit bad pairs (limit=1: is there any conflict at all?)
+def find_non_weakly_separated(subsets, n, limit=None):
     bad_pairs = []
     conflict_map = {i: [] for i in range(len(subsets))}
+    for i, j in islice(iter_non_weakly_separated(subsets, n), limit):
+        bad_pairs.append((i, j, subsets[i], subsets[j]))
+        conflict_map[i].append(j)
+        conflict_map[j].append(i)
+    return bad_pairs, conflict_map
+
+# ───────────────────────
+# Conflict counts
+# ───────────────────────
+# Number of conflicts per subset without keeping any pair, so memory does not grow
+# with the number of conflicts. The total number of bad pairs is sum(counts) // 2.
+def conflict_counts(subsets, n):
+    if n <= 64 and kernels.compiled():
+        return array("L", kernels.conflictCounts([subset_to_mask(sub) for sub in subsets]))
+    counts = array("L", bytes(array("L").itemsize * len(subsets)))
+    for i, j in iter_non_weakly_separated(subsets, n):
+        counts[i] += 1
+        counts[j] += 1
+    return counts
+
+def top_offenders(counts, top=10):
+    """(index, count) of the *top* subsets with the most conflicts, most first; zeros left out."""
+    return [(i, counts[i]) for i in heapq.nlargest(top, range(len(counts)), key=counts.__getitem__) if counts[i]]
+
+# ───────────────────────
+# Symmetry-reduced check
+# ───────────────────────
+# If the collection is closed under x -> x+l (mod n), (A, B) is weakly separated
+# iff (A+l, B+l) is, so it is enough to check one representative per orbit
+# against the whole collection and carry each conflict around the orbit.
+# Collections that are not closed (or have repeated subsets) get the full check.
+def _orbit_structure(subsets, n, l):
+    # (shift, orbit_id, representatives), or None if the collection is not closed under x -> x+l
+    index = {sub: i for i, sub in enumerate(subsets)}
+    shift = [index.get(add_mod(sub, l, n)) for sub in subsets]
+    if len(index) != len(subsets) or None in shift:
+        return None
+    orbit_id = [None] * len(subsets)
+    representatives = []
+    for i, sub in enumerate(subsets):
+        if orbit_id[i] is None:
+            for member in orbit(sub, l, n):
+                orbit_id[index[member]] = len(representatives)
+            representatives.append(i)
+    return shift, orbit_id, representatives
+
+# With limit, stops once limit conflicts are known and returns limit of them (in order, but not
+# necessarily the first limit of the full list)
+def find_non_weakly_separated_symmetric(subsets, n, l, limit=None):
+    structure = _orbit_structure(subsets, n, l)
+    if structure is None:
+        return find_non_weakly_separated(subsets, n, limit)
+    shift, orbit_id, representatives = structure
+
+    masks = [subset_to_mask(sub) for sub in subsets]
+    d = n // gcd(n, l)
+
+    # A pair between two different orbits is reached from the representative of the earlier one
+    conflicts = set()
+    for i in representatives:
+        for j in range(len(subsets)):
+            if orbit_id[j] < orbit_id[i] or j == i:
+                continue
+            if not weakly_separated_masks(masks[i], masks[j]):
+                a, b = i, j
+                for _ in range(d):
+                    conflicts.add((min(a, b), max(a, b)))
+                    a, b = shift[a], shift[b]
+                if limit is not None and len(conflicts) >= limit:
+                    break
+        if limit is not None and len(conflicts) >= limit:
+            break
+
+    bad_pairs = []
+    conflict_map = {i: [] for i in range(len(subsets))}
+    for i, j in sorted(conflicts)[:limit]:
+        bad_pairs.append((i, j, subsets[i], subsets[j]))
+        conflict_map[i].append(j)
+        conflict_map[j].append(i)
+    return bad_pairs, conflict_map
+
+# Every bad pair (i, j), i < j, as two ints in (i, j) order, for a collection closed under
+# x -> x+l. Only the representatives' rows are checked (with the NumPy tiles for
+# engine="numpy"); the row of the member t steps along an orbit is its representative's
+# row with every index moved t steps along its own orbit. Not closed: the full check.
+def iter_non_weakly_separated_symmetric(subsets, n, l, engine="python", block_size=512, packed=None):
+    structure = _orbit_structure(subsets, n, l)
+    if structure is None:
+        if engine == "numpy":
+            pairs, _ = find_non_weakly_separated_np(subsets, n, block_size=block_size, packed=packed)
+            yield from zip(pairs[:, 0].tolist(), pairs[:, 1].tolist())
+        else:
+            yield from iter_non_weakly_separated(subsets, n)
+        return
+    shift, orbit_id, representatives = structure
+
+    # members[o] lists orbit o from its representative on; position[i] is i's place in it
+    members = []
+    position = [0] * len(subsets)
+    for r in representatives:
+        cycle = [r]
+        while shift[cycle[-1]] != r:
+            position[shift[cycle[-1]]] = len(cycle)
+            cycle.append(shift[cycle[-1]])
+        members.append(cycle)
+
+    rows = _representative_rows(subsets, n, representatives, engine, block_size, packed)
     for i in range(len(subsets)):
-        for j in range(i + 1, len(subsets)):
-            A = subsets[i]
-            B = subsets[j]
-            if not weakly_separated_correct(A, B, n):
-                bad_pairs.append((i, j, A, B))
-                conflict_map[i].append(j)
-                conflict_map[j].append(i)
+        t = position[i]
+        row = []
+        for j in rows[orbit_id[i]]:
+            cycle = members[orbit_id[j]]
+            j = cycle[(position[j] + t) % len(cycle)]
+            if j > i:
+                row.append(j)
+        row.sort()
+        for j in row:
+            yield i, j
+
+def _representative_rows(subsets, n, representatives, engine, block_size, packed):
+    # For each representative, array('i') of every index it is not weakly separated from
+    rows = []
+    if engine == "numpy":
+        if packed is None:
+            packed = pack_subsets(subsets, n)
+        m = packed.shape[0]
+        for r0 in range(0, len(representatives), block_size):
+            chunk = representatives[r0:r0 + block_size]
+            found = [[] for _ in chunk]
+            for j0 in range(0, m, block_size):
+                ii, jj = np.nonzero(_np_conflict_tile(packed[chunk], packed[j0:j0 + block_size]))
+                for a, b in zip(ii.tolist(), (jj + j0).tolist()):
+                    found[a].append(b)
+            rows.extend(array("i", row) for row in found)
+        return rows
+    masks = [subset_to_mask(sub) for sub in subsets]
+    for r in representatives:
+        a = masks[r]
+        rows.append(array("i", (j for j in range(len(masks)) if not weakly_separated_masks(a, masks[j]))))
+    return rows
+
+def is_weakly_separated_symmetric(collection, n, l):
+    bad_pairs, _ = find_non_weakly_separated_symmetric(list(collection), n, l, limit=1)
+    return not bad_pairs
+
+# Conflicts per subset are the same along an orbit, so only representatives are counted
+def conflict_counts_symmetric(subsets, n, l):
+    structure = _orbit_structure(subsets, n, l)
+    if structure is None:
+        return conflict_counts(subsets, n)
+    _, orbit_id, representatives = structure
+    masks = [subset_to_mask(sub) for sub in subsets]
+    per_orbit = []
+    for i in representatives:
+        a = masks[i]
+        per_orbit.append(sum(1 for j in range(len(masks)) if j != i and not weakly_separated_masks(a, masks[j])))
+    return array("L", (per_orbit[orbit_id[i]] for i in range(len(subsets))))
+
+# ───────────────────────
+# NumPy batched engine
+# ───────────────────────
+# Subsets are packed into an (m, W) uint64 array, W = ceil(n/64), with element x
+# at bit (x-1)%64 of word (x-1)//64. Pairs are then checked a block_size x
+# block_size tile at a time, so peak memory is bounded by the block size and not
+# by the number of subsets.
+def pack_subsets(subsets, n):
+    if np is None:
+        raise ImportError("numpy is required for the packed engine. Run 'pip install numpy'.")
+    words = (n + 63) // 64
+    packed = np.zeros((len(subsets), words), dtype=np.uint64)
+    if isinstance(subsets, PackedSubsets) and len(subsets):
+        # Straight from the flat array: one scatter instead of a Python loop per element
+        elements = np.frombuffer(subsets.data, dtype=np.dtype(subsets.data.typecode)).astype(np.int64) - 1
+        rows = np.repeat(np.arange(len(subsets)), subsets.k)
+        bits = np.left_shift(np.uint64(1), (elements % 64).astype(np.uint64))
+        np.bitwise_or.at(packed, (rows, elements // 64), bits)
+        return packed
+    for i, sub in enumerate(subsets):
+        for x in sub:
+            packed[i, (x - 1) // 64] |= np.uint64(1) << np.uint64((x - 1) % 64)
+    return packed
+
+def _np_above_lowest(x):
+    # Bits strictly above the lowest set bit of each word (0 for a zero word)
+    one = np.uint64(1)
+    low = x & (~x + one)
+    return ~((low << one) - one)
+
+def _np_below_highest(x):
+    # Bits strictly below the highest set bit of each word (0 for a zero word)
+    for shift in (1, 2, 4, 8, 16, 32):
+        x = x | (x >> np.uint64(shift))
+    return x >> np.uint64(1)
+
+def _np_inside_span(a, b):
+    # For each row: does a have a bit strictly between the lowest and highest bit of b?
+    nonzero = b != 0
+    lower = np.logical_or.accumulate(nonzero, axis=-1)
+    higher = np.logical_or.accumulate(nonzero[..., ::-1], axis=-1)[..., ::-1]
+    lower = np.concatenate([np.zeros_like(lower[..., :1]), lower[..., :-1]], axis=-1)
+    higher = np.concatenate([higher[..., 1:], np.zeros_like(higher[..., :1])], axis=-1)
+    full = np.uint64(0xFFFFFFFFFFFFFFFF)
+    above_low = np.where(lower, full, _np_above_lowest(b))
+    below_high = np.where(higher, full, _np_below_highest(b))
+    return np.any((a & above_low & below_high) != 0, axis=-1)
+
+def _np_conflict_tile(rows, cols):
+    # Boolean (len(rows), len(cols)) matrix, True where the pair is NOT weakly separated
+    A = rows[:, None, :]
+    B = cols[None, :, :]
+    a_only = A & ~B
+    b_only = B & ~A
+    return _np_inside_span(a_only, b_only) & _np_inside_span(b_only, a_only)
+
+# With counts_only no pairs are kept (pairs comes back empty); with limit the tiles stop after
+# the first tile that brings the number of pairs to limit, and only the pairs still needed are
+# kept from it. The limit pairs come back in order, but are not necessarily the first limit of
+# the full list (a later tile in the same block row can hold smaller ones); counts only cover them.
+def find_non_weakly_separated_np(subsets, n, block_size=512, packed=None, limit=None, counts_only=False):
+    if packed is None:
+        packed = pack_subsets(subsets, n)
+    m = packed.shape[0]
+    pair_chunks = []
+    found = 0
+    counts = np.zeros(m, dtype=np.int64)
+    for i0 in range(0, m, block_size):
+        if limit is not None and found >= limit:
+            break
+        i1 = min(i0 + block_size, m)
+        for j0 in range(i0, m, block_size):
+            j1 = min(j0 + block_size, m)
+            tile = _np_conflict_tile(packed[i0:i1], packed[j0:j1])
+            if i0 == j0:
+                tile = np.triu(tile, k=1)
+            ii, jj = np.nonzero(tile)
+            if limit is not None:
+                ii, jj = ii[:limit - found], jj[:limit - found]
+            if ii.size:
+                ii = ii + i0
+                jj = jj + j0
+                if not counts_only:
+                    pair_chunks.append(np.stack([ii, jj], axis=1))
+                found += ii.size
+                counts += np.bincount(ii, minlength=m)
+                counts += np.bincount(jj, minlength=m)
+            if limit is not None and found >= limit:
+                break
+    if pair_chunks:
+        pairs = np.concatenate(pair_chunks)
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))][:limit]
+    else:
+        pairs = np.zeros((0, 2), dtype=np.int64)
+    return pairs, counts
+
+# Same (bad_pairs, conflict_map) shape as find_non_weakly_separated, built from the NumPy engine
+def find_non_weakly_separated_batched(subsets, n, block_size=512, packed=None, limit=None):
+    pairs, _ = find_non_weakly_separated_np(subsets, n, block_size=block_size, packed=packed, limit=limit)
+    bad_pairs = []
+    conflict_map = {i: [] for i in range(len(subsets))}
+    for i, j in pairs.tolist():
+        bad_pairs.append((i, j, subsets[i], subsets[j]))
+        conflict_map[i].append(j)
+        conflict_map[j].append(i)
     return bad_pairs, conflict_map
 
-def parse_input_from_file(filename, k):
-    with open(filename, 'r') as f:
-        raw = f.read()
-    return parse_input(raw, k)
+# ───────────────────────
+# Conflict graph (CSR)
+# ───────────────────────
+# The conflict graph has a vertex per subset and an edge per bad pair. In CSR form the
+# neighbours of vertex i are indices[offsets[i]:offsets[i+1]], in increasing order, and
+# each edge appears once from each end. offsets has len(subsets)+1 entries. Arrays are
+# NumPy int32 (int64 offsets past 2**31 entries) when numpy is installed, array('i')
+# / array('q') otherwise. Pairs are streamed into two flat int arrays and never become
+# Python tuples. With l (--symmetry) the pairs come from iter_non_weakly_separated_symmetric,
+# whose representative rows are checked with the engine given.
+def _conflict_pair_arrays(subsets, n, engine="python", block_size=512, packed=None, l=None):
+    # (first, second) flat arrays of every bad pair (i < j)
+    if engine == "numpy" and l is None:
+        pairs, _ = find_non_weakly_separated_np(subsets, n, block_size=block_size, packed=packed)
+        return pairs[:, 0], pairs[:, 1]
+    first, second = array("i"), array("i")
+    if l is not None:
+        pairs = iter_non_weakly_separated_symmetric(subsets, n, l, engine, block_size, packed)
+    else:
+        pairs = iter_non_weakly_separated(subsets, n)
+    for i, j in pairs:
+        first.append(i)
+        second.append(j)
+    return first, second
+
+def conflict_graph_csr(subsets, n, engine="python", block_size=512, packed=None, l=None):
+    m = len(subsets)
+    first, second = _conflict_pair_arrays(subsets, n, engine, block_size, packed, l)
+    if np is not None:
+        first = np.asarray(first, dtype=np.int64)
+        second = np.asarray(second, dtype=np.int64)
+        rows = np.concatenate([first, second])
+        cols = np.concatenate([second, first])
+        order = np.lexsort((cols, rows))
+        degrees = np.bincount(rows, minlength=m)
+        offsets = np.zeros(m + 1, dtype=np.int64 if rows.size >= 2**31 else np.int32)
+        np.cumsum(degrees, out=offsets[1:])
+        return offsets, cols[order].astype(np.int32)
+
+    degrees = array("q", bytes(8 * m))
+    for i, j in zip(first, second):
+        degrees[i] += 1
+        degrees[j] += 1
+    offsets = array("q" if 2 * len(first) >= 2**31 else "i", [0]) * (m + 1)
+    for i in range(m):
+        offsets[i + 1] = offsets[i] + degrees[i]
+    indices = array("i", bytes(4 * offsets[m]))
+    fill = array("q", offsets[:m])
+    # Pairs come sorted by (i, j): the first pass fills each row's smaller neighbours and the
+    # second its larger ones, both in increasing order
+    for i, j in zip(first, second):
+        indices[fill[j]] = i
+        fill[j] += 1
+    for i, j in zip(first, second):
+        indices[fill[i]] = j
+        fill[i] += 1
+    return offsets, indices
+
+def save_conflict_graph(path, offsets, indices, subsets=None, n=None):
+    if np is None:
+        raise ImportError("numpy is required to save .npz files. Run 'pip install numpy'.")
+    arrays = {"offsets": np.asarray(offsets), "indices": np.asarray(indices, dtype=np.int32)}
+    if subsets is not None:
+        k = len(subsets[0]) if len(subsets) else 0
+        arrays["subsets"] = np.array(list(subsets), dtype=np.int32).reshape(len(subsets), k)
+    if n is not None:
+        arrays["n"] = np.int32(n)
+    np.savez_compressed(path, **arrays)
+
+# Equivalence check of the bitmask kernel against the brute-force reference.
+# Exhaustive over all pairs of subsets of {1..n} for n <= exhaustive_n, then
+# random k-subset pairs up to max_n.
+def test_weakly_separated_kernel(exhaustive_n=7, max_n=40, trials=20000, seed=0, verbose=True):
+    import random
+    rng = random.Random(seed)
+    mismatches = []
+    for n in range(1, exhaustive_n + 1):
+        everything = [c for r in range(n + 1) for c in combinations(range(1, n + 1), r)]
+        for A in everything:
+            for B in everything:
+                if weakly_separated(A, B, n) != weakly_separated_correct(A, B, n):
+                    mismatches.append((n, A, B))
+    for _ in range(trials):
+        n = rng.randint(2, max_n)
+        k = rng.randint(1, n - 1)
+        A = tuple(sorted(rng.sample(range(1, n + 1), k)))
+        B = tuple(sorted(rng.sample(range(1, n + 1), k)))
+        if weakly_separated(A, B, n) != weakly_separated_correct(A, B, n):
+            mismatches.append((n, A, B))
+    if verbose:
+        if mismatches:
+            print(f"{len(mismatches)} mismatch(es) between kernels, first: {mismatches[0]}")
+        else:
+            print("Bitmask kernel agrees with weakly_separated_correct on every case.")
+    return mismatches
+
+# Agreement check of the compiled kernels (swsc.kernels) against the pure-Python path on
+# random collections: conflict pairs and counts here, orbit and orbitKey in swsc.core.
+# Without Numba the kernel code is run by the interpreter instead (needs numpy).
+def test_kernel_backends(max_n=64, trials=200, seed=0, verbose=True):
+    import random
+    from swsc.core import orbit as core_orbit, orbitKey
+
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(trials):
+        n = rng.randint(2, max_n)
+        k = rng.randint(1, n - 1)
+        l = rng.randint(1, n)
+        subsets = [tuple(sorted(rng.sample(range(1, n + 1), k))) for _ in range(rng.randint(1, 40))]
+        cases.append((n, k, l, subsets))
+    cases.append((12, 4, 1, [(1, 2, 3, 4)]))              # Consecutive seed: orbit under x -> x+1
+
+    def run():
+        return [(list(iter_non_weakly_separated(subsets, n)), list(conflict_counts(subsets, n)),
+                 [core_orbit(sub, l, n, verbose=False) for sub in subsets],
+                 [orbitKey(sub, l, n) for sub in subsets])
+                for n, k, l, subsets in cases]
+
+    previous = kernels.kernelBackend()
+    try:
+        kernels.setKernelBackend("python")
+        reference = run()
+        try:
+            backend = kernels.setKernelBackend("numba")
+        except ImportError:
+            backend = kernels.setKernelBackend("interpreted")
+        accelerated = run()
+    finally:
+        kernels.setKernelBackend(previous)
+    mismatches = [case for case, a, b in zip(cases, reference, accelerated) if a != b]
+    if verbose:
+        if mismatches:
+            print(f"{len(mismatches)} mismatch(es) between the python and {backend} backends, "
+                  f"first: n={mismatches[0][0]}, l={mismatches[0][2]}")
+        else:
+            print(f"The {backend} backend agrees with the python backend on {len(cases)} random collections.")
+    return mismatches
+
+# ───────────────────────
+# Streaming input
+# ───────────────────────
+# Text input is read line by line (from a file, "-" for stdin, or an mmap of the
+# file) and parsed a chunk of lines at a time into one flat array of k elements
+# per subset, so nothing but that array is kept. Lines that are not k distinct
+# integers in 1..n are reported with their line number and skipped.
+class PackedSubsets:
+    """Read-only sequence of sorted k-tuples stored flat in an array.array."""
 
-def driver(raw_input=None, n=None, k=None, filename=None):
-    if filename:
-        subsets = parse_input_from_file(filename, k)
+    def __init__(self, k, n=None):
+        self.k = k
+        self.data = array("H" if n is not None and n < 1 << 16 else "I")
+
+    def __len__(self):
+        return len(self.data) // self.k if self.k else 0
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("subset index out of range")
+        return tuple(self.data[i * self.k:(i + 1) * self.k])
+
+    def __iter__(self):
+        data, k = self.data, self.k
+        for at in range(0, len(data), k):
+            yield tuple(data[at:at + k])
+
+class MappedSubsets:
+    """Read-only sequence of sorted tuples over packed rows (e.g. a collection file memmap).
+
+    A row is decoded only when it is indexed, so the NumPy engine can run on the map while
+    the driver prints just the subsets it reports.
+    """
+
+    def __init__(self, packed):
+        self.packed = packed
+
+    def __len__(self):
+        return self.packed.shape[0]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("subset index out of range")
+        subset = []
+        for w, word in enumerate(self.packed[i].tolist()):
+            x = 64 * w + 1
+            while word:
+                if word & 1:
+                    subset.append(x)
+                word >>= 1
+                x += 1
+        return tuple(subset)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def parse_subset_line(line, k, n=None):
+    """Sorted k-tuple from one input line, or raise ValueError saying what is wrong with it."""
+    try:
+        nums = sorted(int(x) for x in line.split())
+    except ValueError:
+        raise ValueError("not a list of integers") from None
+    if len(nums) != k:
+        raise ValueError(f"expected {k} integers, got {len(nums)}")
+    if nums[0] < 1 or (n is not None and nums[-1] > n):
+        raise ValueError(f"elements must be in 1..{n}" if n is not None else "elements must be positive")
+    if any(a == b for a, b in zip(nums, nums[1:])):
+        raise ValueError("repeated element")
+    return tuple(nums)
+
+def read_subsets(lines, k, n=None, chunk_lines=65536):
+    """Parse an iterable of lines into (PackedSubsets, malformed).
+
+    malformed lists (line number, line, reason) for every non-blank line that is not a
+    subset; blank lines are skipped. *lines* is consumed chunk_lines at a time.
+    """
+    subsets = PackedSubsets(k, n)
+    malformed = []
+    lines = iter(lines)
+    lineNo = 0
+    while True:
+        chunk = list(islice(lines, chunk_lines))
+        if not chunk:
+            break
+        values = []
+        for line in chunk:
+            lineNo += 1
+            if isinstance(line, bytes):
+                line = line.decode()
+            if not line.strip():
+                continue
+            try:
+                values.extend(parse_subset_line(line, k, n))
+            except ValueError as e:
+                malformed.append((lineNo, line.rstrip("\n"), str(e)))
+        subsets.data.extend(values)
+    return subsets, malformed
+
+def iter_input_lines(filename, use_mmap=False):
+    """Lines of *filename* ("-" is stdin), read lazily; with *use_mmap* through an mmap of the file."""
+    if filename == "-":
+        yield from sys.stdin
+        return
+    with open(filename, "rb") as f:
+        if use_mmap:
+            import mmap
+
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:                  # Empty file, nothing to map
+                return
+            with mapped:
+                yield from iter(mapped.readline, b"")
+        else:
+            yield from f
+
+def report_malformed(malformed, shown=20, out=sys.stderr):
+    for lineNo, line, reason in malformed[:shown]:
+        print(f"line {lineNo}: {reason}: {line!r}", file=out)
+    if len(malformed) > shown:
+        print(f"... and {len(malformed) - shown} more malformed line(s)", file=out)
+    if malformed:
+        print(f"Skipped {len(malformed)} malformed line(s).", file=out)
+
+def parse_input_from_file(filename, k, n=None, use_mmap=False, chunk_lines=65536):
+    subsets, malformed = read_subsets(iter_input_lines(filename, use_mmap), k, n, chunk_lines)
+    report_malformed(malformed)
+    return subsets
+
+# limit: stop after that many bad pairs (1 to just decide whether the collection is weakly
+# separated); counts: keep only conflicts per subset and show the top offenders; csr: save
+# the conflict graph in CSR form to that .npz path instead of listing the pairs; complete:
+# search for an l-symmetric completion (l = complete) within max_nodes / max_seconds.
+# Returns the number of bad pairs found (up to limit).
+def driver(raw_input=None, n=None, k=None, filename=None, engine="python", block_size=512, l=None,
+           use_mmap=False, limit=None, counts=False, top=10, csr=None, complete=None, max_nodes=None,
+           max_seconds=None):
+    packed = None
+    if filename and filename != "-" and isCollectionFile(filename):
+        # Binary collection file: n and k come from its header, no text parsing
+        header = readHeader(filename)
+        n, k = header["n"], header["k"]
+        if engine == "numpy":
+            _, packed = readCollection(filename)
+        if engine == "numpy" and l is None and complete is None:
+            # The engine reads the memmap; only the subsets that get printed are decoded
+            subsets = MappedSubsets(packed)
+        else:
+            subsets = list(iterCollectionFile(filename))
+    elif filename:
+        subsets = parse_input_from_file(filename, k, n, use_mmap=use_mmap)
+    else:
+        subsets = parse_input(raw_input, k, n)
+    if complete is not None:
+        result = complete_symmetric_collection(subsets, n, k, complete, max_nodes=max_nodes, max_seconds=max_seconds)
+        messages = {
+            "complete": f"Completed to {k * (n - k) + 1} subsets by adding {len(result['added_orbits'])} orbit(s):",
+            "none": "No completion exists: every branch was searched.",
+            "budget": "Budget spent before a completion was found or ruled out.",
+            "invalid": "The collection is not weakly separated, so it has no completion.",
+        }
+        print(f"{messages[result['status']]}  ({result['candidates']} candidate orbit(s), "
+              f"{result['nodes']} node(s), {result['elapsed_seconds']:.2f} s)")
+        for members in result["added_orbits"]:
+            for sub in members:
+                print(' '.join(map(str, sub)))
+        return 0 if result["status"] == "complete" else 1
+    if csr is not None:
+        offsets, indices = conflict_graph_csr(subsets, n, engine=engine, block_size=block_size, packed=packed, l=l)
+        save_conflict_graph(csr, offsets, indices, subsets, n)
+        edges = len(indices) // 2
+        print(f"Conflict graph: {len(subsets)} vertices, {edges} edges, saved to {csr}.")
+        return edges
+    if counts:
+        if l is not None:
+            per_subset = conflict_counts_symmetric(subsets, n, l)
+        elif engine == "numpy":
+            _, per_subset = find_non_weakly_separated_np(subsets, n, block_size=block_size, packed=packed,
+                                                         counts_only=True)
+            per_subset = per_subset.tolist()
+        else:
+            per_subset = conflict_counts(subsets, n)
+        total = sum(per_subset) // 2
+        print(f"Found {total} non-weakly-separated pairs; "
+              f"{sum(1 for c in per_subset if c)} of {len(per_subset)} subsets have a conflict.\n")
+        if total:
+            print(f"--- Top {top} offenders ---")
+            for i, c in top_offenders(per_subset, top):
+                print(f"#{i+1} ({' '.join(map(str, subsets[i]))}): {c} conflict(s)")
+        return total
+
+    if l is not None:
+        bad_pairs, conflict_map = find_non_weakly_separated_symmetric(subsets, n, l, limit=limit)
+    elif engine == "numpy":
+        bad_pairs, conflict_map = find_non_weakly_separated_batched(subsets, n, block_size=block_size, packed=packed,
+                                                                    limit=limit)
     else:
-        subsets = parse_input(raw_input, k)
-    bad_pairs, conflict_map = find_non_weakly_separated(subsets, n)
+        bad_pairs, conflict_map = find_non_weakly_separated(subsets, n, limit=limit)
 
     # === Output ===
-    print(f"Found {len(bad_pairs)} non-weakly-separated pairs.\n")
+    if limit is not None and len(bad_pairs) >= limit:
+        print(f"Stopped after {len(bad_pairs)} non-weakly-separated pair(s).\n")
+    else:
+        print(f"Found {len(bad_pairs)} non-weakly-separated pairs.\n")
 
     # Show each subset and its conflicts
     for i, conflicts in conflict_map.items():
@@ -120,6 +903,7 @@ def driver(raw_input=None, n=None, k=None, filename=None):
     print("--- Summary of all bad pairs ---")
     for i, j, A, B in bad_pairs:
         print(f"#{i+1} ({' '.join(map(str, A))})  ×  #{j+1} ({' '.join(map(str, B))})")
+    return len(bad_pairs)
 
 
 
@@ -130,12 +914,66 @@ if __name__ == "__main__":
     # Example:
     # python FindBreakers.py "1 3 5\n2 4 5\n3 4 5" 5 3
     # Or manual: raw input = "1 3 5\n2 4 5\n3 4 5", n=5, k=3
-    # Done by brute force, so not efficient for large n, k
-    if len(sys.argv) == 4:
-        filename = sys.argv[1]
-        n = int(sys.argv[2])
-        k = int(sys.argv[3])
-        driver(n=n, k=k, filename=filename)
+    # Checks every pair, so for a large number of subsets prefer the NumPy engine:
+    # python FindBreakers.py input.txt 30 10 --engine numpy --block-size 1024
+    # For output of the generators (closed under x -> x+l), only orbit representatives need checking:
+    # python FindBreakers.py input.txt 12 4 --symmetry 6
+    # A binary collection file (see collectionFile.py) carries n and k in its header:
+    # python FindBreakers.py collection.swsc
+    # Text input is streamed; "-" reads stdin and --mmap maps the file instead of reading it:
+    # generate ... | python FindBreakers.py - 30 10 --engine numpy
+    # Only whether it is weakly separated (exit status 1 if not), the first N conflicts, or counts:
+    # python FindBreakers.py input.txt 30 10 --first
+    # python FindBreakers.py input.txt 30 10 --limit 20
+    # python FindBreakers.py input.txt 30 10 --counts --top 5
+    # Conflict graph as CSR arrays (offsets, indices, subsets, n) in an .npz file:
+    # python FindBreakers.py input.txt 30 10 --csr conflicts.npz
+    # Complete a partial collection closed under x -> x+6 by adding whole orbits (prints the added subsets):
+    # python FindBreakers.py partial.txt 12 4 --complete 6 [--max-nodes N] [--max-seconds S]
+    # python FindBreakers.py --selftest   (checks the bitmask kernel against the reference, and the
+    #                                      compiled kernels against the Python path)
+    # SWSC_KERNELS=python|numba|auto picks the backend of the pair loop (see swsc/kernels.py)
+    import argparse
+    parser = argparse.ArgumentParser(description="Find pairs of k-subsets of [n] that are not weakly separated.")
+    parser.add_argument("filename", nargs="?")
+    parser.add_argument("n", nargs="?", type=int)
+    parser.add_argument("k", nargs="?", type=int)
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python",
+                        help="pairwise Python loop or batched NumPy tiles")
+    parser.add_argument("--block-size", type=int, default=512,
+                        help="tile edge for the NumPy engine; peak memory grows with its square")
+    parser.add_argument("--symmetry", type=int, metavar="L",
+                        help="collection is closed under x -> x+L (mod n); only orbit representatives are checked")
+    parser.add_argument("--mmap", action="store_true",
+                        help="read the input file through mmap")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--first", action="store_true",
+                        help="stop at the first conflict; exit status 1 if there is one")
+    output.add_argument("--limit", type=int, metavar="N", help="stop after N conflicts")
+    output.add_argument("--counts", action="store_true",
+                        help="only count conflicts per subset and show the top offenders")
+    output.add_argument("--csr", metavar="PATH",
+                        help="save the conflict graph as CSR arrays to an .npz file (needs numpy)")
+    output.add_argument("--complete", type=int, metavar="L",
+                        help="search for a completion to k(n-k)+1 subsets by whole orbits of x -> x+L")
+    parser.add_argument("--max-nodes", type=int, help="search node budget for --complete")
+    parser.add_argument("--max-seconds", type=float, help="time budget for --complete")
+    parser.add_argument("--top", type=int, default=10, help="offenders shown with --counts (default 10)")
+    parser.add_argument("--selftest", action="store_true",
+                        help="check the bitmask kernel against weakly_separated_correct and the "
+                             "compiled kernels against the Python path")
+    args = parser.parse_args()
+
+    if args.selftest:
+        mismatches = test_weakly_separated_kernel() + test_kernel_backends()
+        sys.exit(1 if mismatches else 0)
+    elif args.k is not None or (args.filename and args.filename != "-" and isCollectionFile(args.filename)):
+        found = driver(n=args.n, k=args.k, filename=args.filename, engine=args.engine, block_size=args.block_size,
+                       l=args.symmetry, use_mmap=args.mmap, limit=1 if args.first else args.limit,
+                       counts=args.counts, top=args.top, csr=args.csr, complete=args.complete,
+                       max_nodes=args.max_nodes, max_seconds=args.max_seconds)
+        if args.first or args.complete is not None:
+            sys.exit(1 if found else 0)
     else:
         raw_input = """
         1 3 5
@@ -144,4 +982,4 @@ if __name__ == "__main__":
         """
         n = 5
         k = 3
-        driver(raw_input=raw_input, n=n, k=k)
\ No newline at end of file
+        driver(raw_input=raw_input, n=n, k=k, engine=args.engine, block_size=args.block_size)
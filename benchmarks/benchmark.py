@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import FindBreakers
+from swsc import Valgorithm2, orbit, orbitKey, randomOrdering
+from swsc.sweep import algorithmVersion
+
+# Benchmark suite for the generator, the orbit helpers and FindBreakers.
+#
+#   python benchmarks/benchmark.py run [--sizes small,medium,large] [--out results.json]
+#   python benchmarks/benchmark.py compare baseline.json results.json [--threshold 0.1]
+#
+# Every case is (n, k, l, ordering) with ordering "standard" (l, l-1, ..., 1) or
+# "random:<seed>" (randomOrdering with a fixed seed). Cases marked remap have
+# gcd(n, l) != l and go through the makeMapBetween path.
+
+CASES = [
+    # name              size      n    k    l    ordering    remap
+    ("n10-k4-l6",      "small",   10,  4,   6,  "standard", True),
+    ("n12-k4-l6",      "small",   12,  4,   6,  "standard", False),
+    ("n12-k5-l8",      "small",   12,  5,   8,  "random:1", True),
+    ("n30-k10-l10",    "medium",  30, 10,  10,  "standard", False),
+    ("n30-k9-l12",     "medium",  30,  9,  12,  "random:1", True),
+    ("n60-k20-l30",    "medium",  60, 20,  30,  "standard", False),
+    ("n200-k40-l50",   "large",  200, 40,  50,  "standard", False),
+    ("n200-k39-l120",  "large",  200, 39, 120,  "random:1", True),
+    ("n200-k50-l100",  "large",  200, 50, 100,  "standard", False),
+]
+
+# Benchmarks that only make sense below a certain size (the pair and candidate loops are quadratic / C(n,k))
+LIMITS = {
+    "find_non_weakly_separated": {"small", "medium"},
+    "possible_orbit_extensions": {"small"},
+}
+
+REPEATS = {"small": 5, "medium": 3, "large": 1}
+
+def caseOrdering(n, l, ordering):
+    if ordering == "standard":
+        return list(range(l, 0, -1))
+    seed = int(ordering.split(":", 1)[1])
+    return randomOrdering(n, l, random.Random(seed))
+
+def quietly(fn, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+def timeIt(fn, repeat):
+    # Seconds per call. Fast calls are looped (timeit.autorange, >= 0.2 s per sample) to keep the noise down.
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {"best": min(times), "median": statistics.median(times), "repeat": repeat, "number": number}
+
+def benchCase(n, k, l, ordering, size, repeat=None):
+    repeat = repeat or REPEATS[size]
+    ordering = caseOrdering(n, l, ordering)
+    seeds = quietly(Valgorithm2, n, k, l, printSeeds=False, printCollection=False, override=ordering, cache=False)
+    collection = sorted({member for seed in seeds for member in orbit(seed, l, n, verbose=False)})
+
+    benches = {
+        "Valgorithm2": lambda: quietly(Valgorithm2, n, k, l, printSeeds=False, printCollection=False,
+                                       override=ordering, cache=False),
+        "orbit": lambda: [orbit(seed, l, n, verbose=False) for seed in seeds],
+        "orbitKey": lambda: [orbitKey(seed, l, n) for seed in seeds],
+        "find_non_weakly_separated": lambda: FindBreakers.find_non_weakly_separated(collection, n),
+        # Half of the orbits, so there is something left to extend with
+        "possible_orbit_extensions": lambda: FindBreakers.possible_orbit_extensions(
+            sorted({m for seed in seeds[:len(seeds) // 2] for m in orbit(seed, l, n, verbose=False)}), n, k, l),
+    }
+    results = {}
+    for name, fn in benches.items():
+        if size not in LIMITS.get(name, {size}):
+            continue
+        results[name] = timeIt(fn, repeat)
+    return {"n": n, "k": k, "l": l, "ordering": ordering, "size": size, "collection": len(collection),
+            "benchmarks": results}
+
+def run(args):
+    sizes = set(args.sizes.split(","))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "algorithmVersion": algorithmVersion(),
+        },
+        "cases": {},
+    }
+    for name, size, n, k, l, ordering, remap in CASES:
+        if size not in sizes:
+            continue
+        result = benchCase(n, k, l, ordering, size, args.repeat)
+        result["remap"] = remap
+        report["cases"][name] = result
+        timings = ", ".join(f"{b} {t['best'] * 1000:.1f} ms" for b, t in result["benchmarks"].items())
+        print(f"{name:16s} {timings}")
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)["cases"]
+    with open(args.current) as f:
+        current = json.load(f)["cases"]
+
+    regressions = 0
+    for name, case in current.items():
+        for bench, timing in case["benchmarks"].items():
+            before = baseline.get(name, {}).get("benchmarks", {}).get(bench)
+            if before is None:
+                continue
+            ratio = timing["best"] / before["best"] if before["best"] else float("inf")
+            flag = ""
+            if ratio > 1 + args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1 - args.threshold:
+                flag = "  faster"
+            print(f"{name:16s} {bench:28s} {before['best'] * 1000:10.2f} ms -> {timing['best'] * 1000:10.2f} ms"
+                  f"  x{ratio:5.2f}{flag}")
+    if regressions:
+        print(f"\n{regressions} benchmark(s) slower than the baseline by more than {args.threshold:.0%}.")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Valgorithm2, the orbit helpers and FindBreakers.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runParser = commands.add_parser("run", help="time the benchmark grid and write the results to JSON")
+    runParser.add_argument("--sizes", default="small,medium,large",
+                           help="comma separated subset of small, medium, large")
+    runParser.add_argument("--repeat", type=int, default=None,
+                           help="repeats per benchmark (default: 5 small, 3 medium, 1 large)")
+    runParser.add_argument("--out", default="bench_results.json")
+
+    compareParser = commands.add_parser("compare", help="flag benchmarks slower than a saved baseline")
+    compareParser.add_argument("baseline")
+    compareParser.add_argument("current")
+    compareParser.add_argument("--threshold", type=float, default=0.10,
+                               help="allowed relative slowdown of the best time (default 0.10)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
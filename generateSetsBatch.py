@@ -0,0 +1,39 @@
+import argparse
+import random
+import sys
+import time
+
+from swsc import run_batch
+
+# Batch front end: many (n, k, l) requests from a JSONL file or stdin, one process.
+
+# ───────────────────────
+# Main
+# ───────────────────────
+
+if __name__ == "__main__":
+    # Example usage:
+    # python generateSetsBatch.py triples.jsonl --out results.jsonl
+    # printf '[10, 4, 6]\n{"n": 12, "k": 4, "l": 6, "ordering": [1, 2, 3, 4, 5, 6]}\n' | python generateSetsBatch.py -
+    parser = argparse.ArgumentParser(description="Generate collections for many (n, k, l) triples in one process.")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL file of requests, or - for stdin (default)")
+    parser.add_argument("--out", default="-", help="JSONL file for the results, or - for stdout (default)")
+    parser.add_argument("--random", action="store_true",
+                        help="use a random ordering when a request has none (default: l, l-1, ..., 1)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for --random")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    rng = random.Random(args.seed) if args.random else None
+    start = time.perf_counter()
+    try:
+        requests, passed, failed = run_batch(source, out, rng)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{requests} request(s): {passed} passed, {failed} failed or invalid "
+          f"in {time.perf_counter() - start:.2f} s.", file=sys.stderr)
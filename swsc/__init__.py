@@ -0,0 +1,19 @@
+"""Generator for maximal symmetric weakly separated collections.
+
+Importing the package has no side effects and needs nothing outside the standard
+library; numpy (collection files), pyperclip (clipboard output) and numba (compiled
+kernels) are only imported by the functions that use them. The scripts in the
+repository root are thin CLIs over this package.
+"""
+from .core import (ClassTables, Valgorithm2, add_mod, checkConds, classTables, iter_collection, iter_seeds,
+                   makeMapBetween, orbit, orbitKey, randomOrdering)
+from .runners import runAlgorithm, runAlgorithmFull
+from .sweep import check_triple, run_sweep, sweep_triples, test_valgorithm2_up_to
+from .collectionFile import isCollectionFile, iterCollectionFile, readCollection, readHeader, writeCollection
+from .profiling import PhaseProfile
+from .fingerprint import (canonicalMasks, collectionFingerprint, collectionMasks, sameUpToSymmetry,
+                          symmetricFingerprint)
+from .orderings import explore_orderings, iter_orderings, orderingCount, run_orderings, sample_orderings
+from .batch import parseBatchLine, runBatchItem, run_batch
+from .cache import ResultCache
+from .kernels import kernelBackend, setKernelBackend
@@ -0,0 +1,105 @@
+import json
+import time
+
+from .core import checkConds, iter_collection, iter_seeds, randomOrdering
+from .orderings import orderingBlocks
+
+# ───────────────────────
+# Batch generation
+# ───────────────────────
+# One request per JSONL line, either an object {"n": 10, "k": 4, "l": 6, "ordering": [...]}
+# or a list [n, k, l] / [n, k, l, ordering]; the ordering is optional and "id" is copied to
+# the result. Every request runs in this process, so the per-(n, l) class tables
+# (classTables) are built once and reused by every triple with the same n and l.
+
+def parseBatchLine(line):
+    """(n, k, l, ordering, id) from one request line; raises ValueError if it is malformed."""
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"not JSON: {e.msg}") from None
+    if isinstance(request, list):
+        if len(request) not in (3, 4):
+            raise ValueError("expected [n, k, l] or [n, k, l, ordering]")
+        request = dict(zip(("n", "k", "l", "ordering"), request))
+    if not isinstance(request, dict):
+        raise ValueError("expected a JSON object or list")
+    missing = [key for key in ("n", "k", "l") if key not in request]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    n, k, l = request["n"], request["k"], request["l"]
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (n, k, l)):
+        raise ValueError("n, k and l must be integers")
+    ordering = request.get("ordering")
+    if ordering is not None:
+        checkOrdering(n, l, ordering)
+    return n, k, l, ordering, request.get("id")
+
+def checkOrdering(n, l, ordering):
+    """Raise ValueError unless *ordering* is a valid ordering of the l classes for n.
+
+    Each block of orderingBlocks(n, l) must appear in turn, in any order inside it:
+    g+1..l before 1..g when l != g = gcd(n, l), otherwise any permutation of 1..l.
+    """
+    if not isinstance(ordering, list) or not all(isinstance(a, int) and not isinstance(a, bool) for a in ordering):
+        raise ValueError("ordering must be a list of integers")
+    blocks = orderingBlocks(n, l) if n > 0 and l > 0 else [list(range(l, 0, -1))]
+    if len(blocks) == 1:
+        rule = f"a permutation of 1..{l}"
+    else:
+        rule = f"{blocks[0][-1]}..{l} in any order followed by 1..{blocks[1][0]} in any order"
+    if len(ordering) != l:
+        raise ValueError(f"ordering must be {rule}")
+    start = 0
+    for block in blocks:
+        if sorted(ordering[start:start + len(block)]) != sorted(block):
+            raise ValueError(f"ordering must be {rule}")
+        start += len(block)
+
+def runBatchItem(n, k, l, ordering=None, rng=None):
+    """Generate one collection and return its JSON-ready result.
+
+    Without an *ordering* the standard ordering l, l-1, ..., 1 is used, or a random one
+    drawn from *rng* if given.
+    """
+    if not checkConds(n, k, l, False):
+        return {"n": n, "k": k, "l": l, "error": "invalid parameters (checkConds failed)"}
+    if ordering is None:
+        ordering = randomOrdering(n, l, rng) if rng is not None else list(range(l, 0, -1))
+    start = time.perf_counter()
+    seeds = list(iter_seeds(n, k, l, ordering))
+    size = len(set(iter_collection(n, k, l, ordering, seeds=seeds)))
+    elapsed = time.perf_counter() - start
+    expected = k * (n - k) + 1
+    return {"n": n, "k": k, "l": l, "ordering": ordering, "seeds": [list(seed) for seed in seeds],
+            "size": size, "expected": expected, "ok": size == expected, "elapsed_seconds": elapsed}
+
+def run_batch(lines, out, rng=None):
+    """Run every request in *lines* and write one JSON result line per request to *out*.
+
+    Blank lines are skipped; malformed lines and triples that raise get a result with an
+    "error" and the line number. Returns (requests, passed, failed).
+    """
+    requests = passed = failed = 0
+    for lineNo, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        requests += 1
+        try:
+            n, k, l, ordering, requestId = parseBatchLine(line)
+        except ValueError as e:
+            result = {"line": lineNo, "error": str(e)}
+        else:
+            try:
+                result = runBatchItem(n, k, l, ordering, rng)
+            except Exception as e:
+                result = {"n": n, "k": k, "l": l, "error": f"{type(e).__name__}: {e}"}
+            result["line"] = lineNo
+            if requestId is not None:
+                result["id"] = requestId
+        if result.get("ok"):
+            passed += 1
+        else:
+            failed += 1
+        out.write(json.dumps(result) + "\n")
+    return requests, passed, failed
@@ -0,0 +1,106 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+# ───────────────────────
+# On-disk result cache
+# ───────────────────────
+# Seeds of Valgorithm2 runs in an SQLite file, keyed by (n, k, l, ordering) and the
+# algorithmVersion() hash of the whole of swsc/core.py and swsc/kernels.py, so editing
+# any part of the algorithm never serves stale seeds. Rows are zlib-compressed JSON.
+# Every hit refreshes the row's last_used time, and once the stored seeds exceed
+# max_bytes the least recently used rows are evicted.
+#
+# Valgorithm2 and the runners take cache= (a ResultCache or a path); with no argument
+# the file named by the SWSC_CACHE environment variable is used, if it is set, and
+# cache=False turns caching off.
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_version = None
+
+def _algorithmVersion():
+    global _version
+    if _version is None:
+        from .sweep import algorithmVersion
+
+        _version = algorithmVersion()
+    return _version
+
+class ResultCache:
+    """LRU-capped store of Valgorithm2 seeds in an SQLite file."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)    # Sweep workers may share the file
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS valgorithm_results (
+                                 version TEXT, n INTEGER, k INTEGER, l INTEGER, ordering TEXT,
+                                 seeds BLOB, size_bytes INTEGER, rng_seed INTEGER, last_used REAL,
+                                 PRIMARY KEY (version, n, k, l, ordering))""")
+        self.conn.commit()
+
+    def get(self, n, k, l, ordering):
+        """Cached seeds for this run as a list of tuples, or None."""
+        key = (_algorithmVersion(), n, k, l, str(list(ordering)))
+        row = self.conn.execute("SELECT seeds FROM valgorithm_results "
+                                "WHERE version = ? AND n = ? AND k = ? AND l = ? AND ordering = ?", key).fetchone()
+        if row is None:
+            return None
+        self.conn.execute("UPDATE valgorithm_results SET last_used = ? "
+                          "WHERE version = ? AND n = ? AND k = ? AND l = ? AND ordering = ?", (time.time(), *key))
+        self.conn.commit()
+        return [tuple(seed) for seed in json.loads(zlib.decompress(row[0]))]
+
+    def put(self, n, k, l, ordering, seeds, rng_seed=None):
+        """Store the seeds of one run (with the RNG seed that chose a random ordering) and evict."""
+        blob = zlib.compress(json.dumps([list(seed) for seed in seeds]).encode())
+        self.conn.execute("INSERT OR REPLACE INTO valgorithm_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                          (_algorithmVersion(), n, k, l, str(list(ordering)), blob, len(blob), rng_seed,
+                           time.time()))
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        """Drop least recently used rows until the stored seeds fit in max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM valgorithm_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for rowid, size in self.conn.execute("SELECT rowid, size_bytes FROM valgorithm_results "
+                                             "ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((rowid,))
+            total -= size
+        self.conn.executemany("DELETE FROM valgorithm_results WHERE rowid = ?", doomed)
+
+    def stats(self):
+        """(rows, stored bytes) over every algorithm version."""
+        return self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM valgorithm_results").fetchone()
+
+    def close(self):
+        self.conn.close()
+
+_opened = {}
+
+def resolveCache(cache=None):
+    """The ResultCache for a cache= argument: a ResultCache, a path, None for $SWSC_CACHE,
+    or False for no cache.
+
+    Returns None when there is nothing to cache to. Caches opened from a path are reused.
+    """
+    if cache is False:
+        return None
+    if isinstance(cache, ResultCache):
+        return cache
+    path = cache or os.environ.get("SWSC_CACHE")
+    if not path:
+        return None
+    if path not in _opened:
+        _opened[path] = ResultCache(path)
+    return _opened[path]
@@ -0,0 +1,22 @@
+# pyperclip is optional and only imported here, the first time the clipboard is used.
+
+def clipboardAvailable(verbose=True):
+    """True if pyperclip is installed and can reach a clipboard."""
+    try:
+        import pyperclip
+    except ImportError:
+        if verbose:
+            print("pyperclip not installed. Run 'pip install pyperclip' to enable clipboard copy.")
+        return False
+    try:
+        pyperclip.copy("test")
+    except pyperclip.PyperclipException:
+        if verbose:
+            print("pyperclip is installed, but no clipboard mechanism was found. Proceeding without.")
+        return False
+    return True
+
+def copyText(text):
+    import pyperclip
+
+    pyperclip.copy(text)
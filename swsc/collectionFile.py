@@ -0,0 +1,118 @@
+import struct
+import sys
+from array import array
+
+# ───────────────────────
+# Binary collection file
+# ───────────────────────
+# Layout (little endian):
+#   header   magic b"SWSC", version u16, header size u16, n u32, k u32, l u32,
+#            words per subset u32, subset count u64, ordering length u32,
+#            ordering (u32 each), zero padding up to a multiple of 8 bytes
+#   body     count x words uint64. Element x of a subset is bit (x-1)%64 of word (x-1)//64,
+#            the same packing as FindBreakers.pack_subsets.
+# The body can be mapped straight into an (count, words) uint64 array with np.memmap.
+
+MAGIC = b"SWSC"
+VERSION = 1
+_FIXED = struct.Struct("<4sHHIIIIQI")
+
+def wordsFor(n):
+    return (n + 63) // 64
+
+def isCollectionFile(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def _headerBytes(n, k, l, ordering, count):
+    ordering = list(ordering or [])
+    size = _FIXED.size + 4 * len(ordering)
+    size += -size % 8
+    header = _FIXED.pack(MAGIC, VERSION, size, n, k, l, wordsFor(n), count, len(ordering))
+    header += struct.pack(f"<{len(ordering)}I", *ordering)
+    return header + b"\0" * (size - len(header))
+
+def writeCollection(path, subsets, n, k, l, ordering=None):
+    """Write *subsets* (any iterable of k-subsets of 1..n, e.g. iter_collection) to *path*.
+
+    The subsets are streamed to disk; the count in the header is filled in at the end.
+    Returns the number of subsets written.
+    """
+    words = wordsFor(n)
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_headerBytes(n, k, l, ordering, 0))
+        buffer = array("Q")
+        for subset in subsets:
+            packed = [0] * words
+            for x in subset:
+                packed[(x - 1) // 64] |= 1 << ((x - 1) % 64)
+            buffer.extend(packed)
+            count += 1
+            if len(buffer) >= 1 << 16:
+                f.write(_littleEndian(buffer))
+                buffer = array("Q")
+        f.write(_littleEndian(buffer))
+        f.seek(0)
+        f.write(_headerBytes(n, k, l, ordering, count))
+    return count
+
+def _littleEndian(buffer):
+    if sys.byteorder == "big":
+        buffer = array("Q", buffer)
+        buffer.byteswap()
+    return buffer.tobytes()
+
+def readHeader(path):
+    """{"n", "k", "l", "ordering", "words", "count", "offset"} from the file header."""
+    with open(path, "rb") as f:
+        fixed = f.read(_FIXED.size)
+        if len(fixed) < _FIXED.size or fixed[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a collection file")
+        magic, version, size, n, k, l, words, count, orderLen = _FIXED.unpack(fixed)
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported collection file version {version}")
+        ordering = list(struct.unpack(f"<{orderLen}I", f.read(4 * orderLen)))
+    return {"n": n, "k": k, "l": l, "ordering": ordering, "words": words, "count": count, "offset": size}
+
+def readCollection(path):
+    """(header, packed) where packed is a read-only (count, words) uint64 np.memmap."""
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy is required to memory-map a collection file. Run 'pip install numpy'.") from None
+    header = readHeader(path)
+    if header["count"] == 0:
+        return header, np.zeros((0, header["words"]), dtype=np.uint64)
+    packed = np.memmap(path, dtype="<u8", mode="r", offset=header["offset"],
+                       shape=(header["count"], header["words"]))
+    return header, packed
+
+def iterCollectionFile(path):
+    """Yield each subset of a collection file as a sorted tuple, without numpy."""
+    header = readHeader(path)
+    words = header["words"]
+    with open(path, "rb") as f:
+        f.seek(header["offset"])
+        remaining = header["count"]
+        while remaining:
+            batch = min(remaining, 1 << 14)
+            chunk = array("Q")
+            chunk.frombytes(f.read(8 * words * batch))
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            for i in range(batch):
+                subset = []
+                for w in range(words):
+                    word = chunk[i * words + w]
+                    x = 64 * w + 1
+                    while word:
+                        if word & 1:
+                            subset.append(x)
+                        word >>= 1
+                        x += 1
+                yield tuple(subset)
+            remaining -= batch
@@ -0,0 +1,514 @@
+from functools import lru_cache
+from math import gcd
+from typing import Iterator, List, Optional, Sequence, Tuple
+import random
+
+from . import kernels
+from .collectionFile import writeCollection
+
+# ───────────────────────
+# Helper Functions
+# ───────────────────────
+def orbit(subset: Sequence[int], l, n, verbose) -> List[Tuple[int, ...]]:
+    """Rotations of *subset* by multiples of l (mod n), optionally printing each one."""
+    # Adjust *l* to 1 for the canonical consecutive seed
+    if list(subset) == list(range(1, len(subset) + 1)):
+        l = 1
+
+    steps = n // gcd(n, l)
+    if not verbose and steps >= kernels.MIN_ORBIT_STEPS and kernels.compiled():
+        return kernels.orbitTuples(subset, l, n, steps)
+
+    result: List[Tuple[int, ...]] = []
+    current = tuple(subset)
+    seen = set()
+
+    for _ in range(steps):
+        frozen = tuple(sorted(current))
+        if frozen in seen:
+            break
+        seen.add(frozen)
+        result.append(frozen)
+
+        if verbose:
+            print(*frozen)
+
+        current = add_mod(current, l, n)
+
+    return result
+
+def add_mod(subset: Sequence[int], l: int, n: int) -> Tuple[int, ...]:
+    """Add *l* (mod *n*) to every element of *subset*, renumbering to 1‑based."""
+    return tuple(sorted(((x + l - 1) % n) + 1 for x in subset))
+
+def orbitKey(subset: Sequence[int], l, n) -> int:
+    """Integer identifying ``set(orbit(subset, l, n))`` without building the orbit.
+
+    The orbit is the set of rotations of *subset* by multiples of l, or of 1 for the
+    canonical consecutive seed (as in :func:`orbit`); it is determined by gcd(n, step)
+    and its smallest member as a bitmask, which are packed into one integer.
+    """
+    if list(subset) == list(range(1, len(subset) + 1)):
+        l = 1
+    l %= n
+    step = gcd(n, l)
+    full = (1 << n) - 1
+    mask = 0
+    for x in subset:
+        mask |= 1 << (x - 1)
+    if n <= 64 and n // step >= kernels.MIN_KEY_STEPS and kernels.compiled():
+        return (kernels.minRotation(mask, l, n, n // step) << n.bit_length()) | step
+    best = mask
+    for _ in range(n // step - 1):
+        mask = ((mask << l) | (mask >> (n - l))) & full
+        if mask < best:
+            best = mask
+    return (best << n.bit_length()) | step
+
+def checkConds(n,k,l, verbose):
+    if gcd(n, l) == 1:
+        if verbose:
+            print("Failed GCD")
+        return False
+    p = gcd(n, l)
+    modulus = n // p
+    if k % modulus not in {modulus - 1, 0, 1}:
+        if verbose:
+            print(f"Failed K Modulus. k is congruent to {k%modulus} mod n//p ")          
+        return False
+    if k > n / 2:                               # Generated as the complement of the n-k collection
+        return checkConds(n, n - k, l, verbose)
+    if l < n / (k + 1):
+        if verbose:
+            print("Failed l<n/(k+1)")  
+        return False
+    return True
+
+def makeMapBetween(n, k, l):
+    g=gcd(n,l)
+    DictionNtoDL = {}
+    for a in range(1,g+1):
+        x=0
+        while a+x*g <= n:
+            nVerson = a+x*g
+            dlVerson = a+x*l
+            DictionNtoDL[dlVerson] = nVerson
+            x+=1
+            
+    return DictionNtoDL
+    
+def randomOrdering(n, l, rng=random):
+    """Random ordering of the l equivalence classes.
+
+    When l != gcd(n, l) the classes g+1..l come first and the classes 1..g last, as
+    Valgorithm2 requires.
+    """
+    g = gcd(n, l)
+    ordering = []
+    if l != g:
+        avNums = list(range(g+1,l+1))
+        while avNums != []:
+            pick = rng.choice(avNums)
+            avNums.remove(pick)
+            ordering.append(pick)
+        avNums = list(range(1,g+1))
+        avNums.reverse()
+    else:
+        avNums = list(range(1,l+1))
+    while avNums != []:
+        pick = rng.choice(avNums)
+        avNums.remove(pick)
+        ordering.append(pick)
+    return ordering
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+def _lowestBit(mask):
+    """Index of the lowest set bit of a nonzero mask."""
+    return (mask & -mask).bit_length() - 1
+
+def _elements(mask):
+    """Elements of a bitmask set (bit x-1 <=> x), in increasing order."""
+    elements = []
+    while mask:
+        low = mask & -mask
+        elements.append(low.bit_length())
+        mask ^= low
+    return elements
+
+def complementSeeds(seeds, n, k) -> Iterator[Tuple[int, ...]]:
+    """Seeds of the complementary collection in [n] choose n-k, from the seeds of a k run.
+
+    Complements keep weak separation and commute with the rotations, so each seed maps to
+    its complement (one XOR with the full mask). The consecutive seed 1..k maps to 1..n-k
+    instead, so :func:`orbit` still turns it into every consecutive interval.
+    """
+    full = (1 << n) - 1
+    consecutive = tuple(range(1, k + 1))
+    for seed in seeds:
+        if tuple(seed) == consecutive:
+            yield tuple(range(1, n - k + 1))
+            continue
+        mask = full
+        for x in seed:
+            mask ^= 1 << (x - 1)
+        yield tuple(_elements(mask))
+
+def _consecutiveWindows(ordered, a, k):
+    """Yield the k consecutive terms of the circular list *ordered* that contain a, starting
+    with a last (a-k+1, ..., a) and sliding right until a is first."""
+    size = len(ordered)
+    at = ordered.index(a)                       # Find a once
+    start = (at - k+1)%size                     # Find the base for the consecutive terms (a-k+1)
+    ring = (ordered * (k//size + 2))[:size + k] # Unrolled circle, so each window is one slice
+    for u in range(size):
+        s = (start + u)%size
+        yield tuple(ring[s:s + k])
+        if s == at:                             # We are done when a starts on the left
+            return
+
+def _nextAfter(mask, x, n):
+    """First element of *mask* after x going around 1..n (x itself last), or 0 if mask is empty."""
+    above = mask >> x
+    if above:
+        return x + _lowestBit(above) + 1
+    if mask:
+        return _lowestBit(mask) + 1
+    return 0
+
+class ClassTables:
+    """Everything iter_seeds needs that depends only on (n, l), built once by :func:`classTables`.
+
+    When l != gcd(n, l) the classes live in [d*l] (d = n/gcd(n, l)) and are mapped back
+    to [n] through *fixMap*; *size* is the size of the working ring either way. *shift*
+    is the permutation x -> x+l of [size] (index 0 unused) and *classMasks[a]* is the
+    bitmask of a's equivalence class under it, for a in 1..l.
+    """
+
+    def __init__(self, n, l):
+        self.n = n
+        self.l = l
+        self.g = gcd(n, l)
+        self.d = n // self.g
+        self.gcdFix = l != self.g
+        self.fixMap = makeMapBetween(n, 0, l) if self.gcdFix else None
+        self.size = size = self.d * l if self.gcdFix else n
+        self.shift = (0,) + tuple((x+l-1)%size+1 for x in range(1, size + 1))
+        self.classMasks = [0] * (l + 1)
+        for a in range(1, l + 1):
+            mask = 1 << (a - 1)
+            x = self.shift[a]
+            while x != a:                       # Walk a's equivalence class
+                mask |= 1 << (x - 1)
+                x = self.shift[x]
+            self.classMasks[a] = mask
+
+@lru_cache(maxsize=256)
+def classTables(n, l) -> ClassTables:
+    """Cached :class:`ClassTables` for (n, l), shared by every k and ordering in this process."""
+    return ClassTables(n, l)
+
+# ───────────────────────
+# Main Algorithm
+# ───────────────────────
+def iter_seeds(n, k, l, ordering, profile=None) -> Iterator[Tuple[int, ...]]:
+    """Yield the seeds of the collection one at a time, in the order Valgorithm2 lists them.
+
+    *ordering* is the ordering of the l equivalence classes. When l != gcd(n, l) the
+    seeds are already mapped back through :func:`makeMapBetween`. *profile* is an
+    optional :class:`~swsc.profiling.PhaseProfile` to record per-phase timings in.
+    For k > n/2 the seeds are those of the n-k run, complemented (:func:`complementSeeds`).
+    """
+    if k > n / 2:
+        yield from complementSeeds(iter_seeds(n, n - k, l, ordering, profile), n, n - k)
+        return
+
+# ───────────────────────
+# Initialization of variables
+# ───────────────────────
+
+    tables = classTables(n, l)                  # Class masks and the gcd remap, shared across k and orderings
+    g = tables.g
+    gcdFix = tables.gcdFix
+    fixMap = tables.fixMap
+    classMasks = tables.classMasks
+    n = tables.size                             # d*l if we changed n to make l divide it
+    seen_orbits = set()                         # orbitKey of every orbit already found so we are not redundant
+    full = (1 << n) - 1                         # Sets of elements are bitmasks: x in S <=> bit x-1 is set
+    total_Available = full                      # all elements from 1 to n excluding non a terms in a equivalence class
+    previousStepRemoval = full                  # Updated at end of Bi. Does not contain any element from previous Bi
+    tooSmall = False                            # Break condition when we run out of terms throughout the code
+    removedFromRight = False                    # Keeps track if we removed from right of a_i (term in [l]) or from the left
+    steps = 0                                   # Removal loop iterations (for profile)
+    remapSeconds = 0.0                          # Time spent in remap during the current bucket (for profile)
+
+    def remap(candidate):                       # Map a seed back to [n] if we changed n at the start
+        nonlocal remapSeconds
+        if not gcdFix:
+            return candidate
+        if profile is None:
+            return tuple(sorted(fixMap[s] for s in candidate))
+        t = profile.clock()
+        seed = tuple(sorted(fixMap[s] for s in candidate))
+        seconds = profile.clock() - t
+        remapSeconds += seconds
+        profile.add("remap", seconds, 1, bucket=a)
+        return seed
+
+# ───────────────────────
+# Main loop
+# ───────────────────────
+    startAt = l-g
+    if profile is not None:
+        t = profile.clock()
+    for i in range(0,startAt):                  # Remove all buckets before l-g
+        #a=l-i
+        a = ordering[i]
+        previousStepRemoval &= ~classMasks[a]   # Remove a and its equivalence class from previousStepRemoval
+    total_Available = previousStepRemoval       # Set total_Available to be the same as previousStepRemoval
+    if profile is not None:
+        profile.add("prune", profile.clock() - t, startAt)
+    
+    for i in range(startAt,l):                  # iterate through buckets. For now this assumed l < l-1 < l-2 < ... < 1 (a=l-i in setup)
+
+        # ───────────────────────
+        # Set up loop variables
+        # ───────────────────────
+        #a=l-i                                   # Force choice to obey l<l-1<l-2<...
+        a=ordering[i]                            # Choose a based on ordering
+        aBit = 1 << (a - 1)
+        left = []                               # Left half of seed (what comes before a)
+        right = []                              # Right half of seed (a and after)
+        outOfTerms=False                        # Track variable to know if there are any terms we might remove in the right 
+        if profile is not None:
+            t = profile.clock()
+        
+        # ───────────────────────
+        # Set up Total_Available for this bucket
+        # ───────────────────────                       
+
+        aClass = classMasks[a]
+        total_Available &= ~(aClass & ~aBit)    # Remove non a elements of a's equivalence class from Available pool
+        prevCount = _popcount(previousStepRemoval)  # previousStepRemoval does not change until the end of the bucket
+        if profile is not None:
+            profile.add("classes", profile.clock() - t, 1, bucket=a)
+            t = profile.clock()
+
+        # ───────────────────────
+        # Generate all sequencial based on available terms in previousStepRemoval
+        # ───────────────────────
+
+        ordered = _elements(previousStepRemoval)  # Puts them into sorted order
+        iterConsecs = _consecutiveWindows(ordered, a, k)  # Sets to iterate on (all consecutive), made lazily
+        if profile is not None:
+            profile.add("consecutive", profile.clock() - t, (k-1)%len(ordered)+1, bucket=a)
+            steps = 0
+            remapSeconds = 0.0
+            t = profile.clock()
+
+        # ───────────────────────
+        # Begin loop for all consecutive numbers
+        # ───────────────────────
+        for consec in iterConsecs:             
+
+            candidate = tuple(consec)
+            orbit_repr = orbitKey(candidate, l, n)
+
+            if orbit_repr not in seen_orbits:
+                seen_orbits.add(orbit_repr)
+                yield remap(candidate)
+
+
+            # ───────────────────────
+            # Construct Left and Right for this starting seed
+            # ───────────────────────
+            # left only ever loses its first element, so it is a list read from leftStart on.
+            # right keeps its list order (its last element decides what is added next) and both
+            # halves are mirrored in bitmasks for the membership tests.
+            j = consec.index(a)
+            left = list(consec[:j])                         # Construct left until we reach a
+            right = list(consec[j:])                        # Starting at a, finish off right so that left+right has size k
+            leftStart = 0
+            leftMask = 0
+            for x in left:
+                leftMask |= 1 << (x - 1)
+            rightMask = 0
+            for x in right:
+                rightMask |= 1 << (x - 1)
+            outOfTerms = not (rightMask & ~total_Available)  # Out of terms to remove from right if all of right is available
+            # ───────────────────────
+            # Main removal loop given a starting seed
+            # ───────────────────────
+            while (not outOfTerms or leftStart < len(left)):   # While there are terms to iterate on (if we can shift from left or have things on right)
+                if prevCount==k:                    # No items to add, so we are done
+                    break
+                if(tooSmall):                       # Break condition when things underflow
+                    break
+                removedFromRight = False
+                steps += 1
+        
+
+                # ───────────────────────
+                # Removing a certain elemenet
+                # ───────────────────────
+                
+                if not outOfTerms:
+                    for i in range(len(right)-1, -1, -1):   # Try to remove an element from the right side, right to left
+                        r = right[i]
+                        if not total_Available >> (r - 1) & 1:  # If r is in the equivalence class for a
+                            removedFromRight = True     
+                            right.remove(r)             # Remove r
+                            rightMask &= ~(1 << (r - 1))
+                            break
+                if not removedFromRight:                # If we did not remove from the right, we remove from the left (we can assume there will be one by initial check)    
+                    leftMask &= ~(1 << (left[leftStart] - 1))
+                    leftStart += 1
+
+                # ───────────────────────
+                # Adding a new elemenet to the right
+                # ───────────────────────
+
+                if removedFromRight:                    # If we removed from right and it was in the equivalence class (so we add to the end)
+                    x = _nextAfter(total_Available & ~(leftMask | rightMask), right[-1], n)
+                    if x == 0:                          # Break condition if no consecutive to add
+                        tooSmall = True
+                        break
+                    right.append(x)                     # Add the next consecutive non-equivalence class element into right
+                    rightMask |= 1 << (x - 1)
+                else:
+                    fillGap = False
+                    if(len(right)>2):                   # Look for gaps in right to fill first
+                        free = previousStepRemoval & ~(leftMask | rightMask)
+                        for index in range(len(right)-1):
+                            here, there = right[index], right[index+1]
+                            if there == here%n+1:       # If next is present, skip (short case)
+                                continue
+                            x = _nextAfter(free, here, n)    # First free term after here; a gap if it comes before there
+                            if x and (x - here) % n < (there - here) % n:
+                                right.append(x)
+                                right.sort()
+                                rightMask |= 1 << (x - 1)
+                                fillGap = True
+                                break
+                                
+                    if not fillGap:                              # If no gaps, add the next consecutive non-equivalence class element into right
+                        last = right[-1]
+                        above = previousStepRemoval >> last      # Terms after last (no wrap around)
+                        if not above:
+                            tooSmall = True
+                            break
+                        x = last + _lowestBit(above) + 1
+                        right.append(x)                          # Add term
+                        rightMask |= 1 << (x - 1)
+                # ───────────────────────
+                # Add seed and set up for next iteration
+                # ───────────────────────
+
+
+                outOfTerms = not (rightMask & ~total_Available)  # Check if we have terms to remove in the right
+                    
+                candidate = tuple(sorted(left[leftStart:] + right))
+                orbit_repr = orbitKey(candidate, l, n)
+
+                if orbit_repr not in seen_orbits:
+                    seen_orbits.add(orbit_repr)                 # Add new seed if we have not seen it before
+                    yield remap(candidate)
+        if profile is not None:
+            profile.add("removal", profile.clock() - t - remapSeconds, steps, bucket=a)
+            t = profile.clock()
+
+        previousStepRemoval &= ~aClass                          # Remove a and its equivalence class from previousStepRemoval
+        total_Available &= ~aBit                                # Variable cleanup with discarding
+        if profile is not None:
+            profile.add("classes", profile.clock() - t, 1, bucket=a)
+        if(_popcount(previousStepRemoval) < k):                 # Check if we have another bucket
+            break
+
+def iter_collection(n, k, l, ordering, seeds=None) -> Iterator[Tuple[int, ...]]:
+    """Yield every subset of the collection, orbit by orbit (the order the collection is printed in).
+
+    Pass *seeds* to reuse seeds that were already generated instead of running :func:`iter_seeds`.
+    """
+    if seeds is None:
+        seeds = iter_seeds(n, k, l, ordering)
+    for seed in seeds:
+        yield from orbit(seed, l, n, verbose=False)
+
+def Valgorithm2(n, k, l, printSeeds=True, printCollection=True, stOrder=True, override=[],
+                copyToClipboard=False, savePath=None, profile=None, cache=None, rngSeed=None):
+    """Generate the seeds of a maximal l-symmetric weakly separated collection.
+
+    The ordering of the l equivalence classes is *override* if given, otherwise the
+    standard ordering l, l-1, ..., 1 (*stOrder*) or a random valid one drawn with the
+    RNG seed *rngSeed* (a fresh one is drawn and printed if not given). The seeds are
+    returned; the collection can also be printed, copied to the clipboard (needs
+    pyperclip) or written to *savePath* as a binary collection file. Pass a
+    :class:`~swsc.profiling.PhaseProfile` as *profile* to time each phase.
+
+    *cache* is a :class:`~swsc.cache.ResultCache` or the path of one (default: $SWSC_CACHE,
+    if set); seeds found there are returned without running the algorithm. When profiling
+    the lookup is skipped, so the phases are always timed (the result is still stored).
+    """
+
+# ───────────────────────
+# Choice of ordering
+# ───────────────────────
+
+    if stOrder:
+        ordering= list(range(1,l+1))  # Just a list from 1 to n for ordering purposes
+        ordering.reverse()
+        print("Standard ordering:", ordering)
+    elif override == []:
+        if rngSeed is None:
+            rngSeed = random.randrange(2**32)   # Recorded so the run can be repeated (and cached)
+        ordering = randomOrdering(n, l, random.Random(rngSeed))
+        print(f"Random ordering (seed {rngSeed}):", ordering)
+    if override != []:
+        ordering = override
+        print("Override ordering:", ordering)
+
+    from .cache import resolveCache
+
+    cache = resolveCache(cache)
+    runK = n - k if k > n / 2 else k            # k > n/2 is the complement of the n-k run, which is what gets cached
+    seedsList: Optional[List[Tuple[int, ...]]] = None
+    if cache is not None and profile is not None:
+        print("Profiling: cache lookup skipped.")
+    elif cache is not None:
+        seedsList = cache.get(n, runK, l, ordering)
+    if seedsList is not None:
+        print("Seeds loaded from cache.")
+    else:
+        seedsList = list(iter_seeds(n, runK, l, ordering, profile))    # Keeps all seeds
+        if cache is not None:
+            cache.put(n, runK, l, ordering, seedsList, rngSeed if not stOrder and override == [] else None)
+    if runK != k:
+        seedsList = list(complementSeeds(seedsList, n, runK))
+
+    if profile is not None:
+        t = profile.clock()
+    if printSeeds:
+        print("\nBegin list of seeds:\n")                       # Print seeds if we are in verbose mode
+        for seed in seedsList:
+            print(seed)
+        print("\nEnd list of seeds:\n")
+    if printCollection:
+        print("\nBegin generating collection:\n")
+
+        for member in iter_collection(n, k, l, ordering, seeds=seedsList):
+            print(*member)
+        print("\nEnd generating collection:\n")
+    if copyToClipboard:
+        from .clipboard import copyText                     # pyperclip is only imported when asked for
+
+        copyText("".join(" ".join(map(str, member)) + "\n"   # Same text as the printed collection
+                         for member in iter_collection(n, k, l, ordering, seeds=seedsList)))
+    if savePath:
+        # Binary collection file (see collectionFile.py), each subset once
+        members = dict.fromkeys(iter_collection(n, k, l, ordering, seeds=seedsList))
+        writeCollection(savePath, members, n, k, l, ordering)
+        print(f"Saved {len(members)} subsets to {savePath}")
+    if profile is not None:
+        profile.add("print", profile.clock() - t, len(seedsList))
+    return seedsList
@@ -0,0 +1,77 @@
+import hashlib
+from typing import Iterable, List, Sequence
+
+# ───────────────────────
+# Collection fingerprints
+# ───────────────────────
+# A collection is stored as the sorted list of its members as bitmasks (element x is
+# bit x-1), which does not depend on the order the members were generated in. The
+# fingerprint is a hash of that list, so two collections can be compared (or put in
+# a dict) without keeping every subset around.
+
+def subsetMask(subset: Sequence[int]) -> int:
+    mask = 0
+    for x in subset:
+        mask |= 1 << (x - 1)
+    return mask
+
+def collectionMasks(members: Iterable[Sequence[int]]) -> List[int]:
+    """Sorted bitmasks of the distinct members of a collection."""
+    return sorted({subsetMask(member) for member in members})
+
+def masksFingerprint(masks: Sequence[int], n) -> str:
+    """Hash of a sorted mask list; each mask is hashed as (n + 7) // 8 little endian bytes."""
+    width = (n + 7) // 8
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(n.to_bytes(4, "little"))
+    for mask in masks:
+        digest.update(mask.to_bytes(width, "little"))
+    return digest.hexdigest()
+
+def collectionFingerprint(members: Iterable[Sequence[int]], n) -> str:
+    """Fingerprint of a collection of subsets of [n], independent of the order of *members*."""
+    return masksFingerprint(collectionMasks(members), n)
+
+# ───────────────────────
+# Symmetry-invariant fingerprints
+# ───────────────────────
+# Relabeling [n] by a rotation x -> x+r (and, with reflection, x -> n+1-x) maps a
+# collection to an equivalent one. The canonical form is the lexicographically
+# smallest sorted mask list over all n (or 2n) relabelings, so equivalent collections
+# get the same fingerprint. Comparing canonical forms is the exact check.
+
+def rotateMask(mask, r, n):
+    """Bitmask of the subset with r added (mod n) to every element."""
+    r %= n
+    if r == 0:
+        return mask
+    return ((mask << r) | (mask >> (n - r))) & ((1 << n) - 1)
+
+def reflectMask(mask, n):
+    """Bitmask of the subset with every element x replaced by n+1-x."""
+    return int(format(mask, f"0{n}b")[::-1], 2)
+
+def canonicalMasks(masks: Sequence[int], n, reflection=False) -> List[int]:
+    """Smallest sorted mask list among the rotations (and reflections) of *masks*."""
+    images = [list(masks)]
+    if reflection:
+        images.append([reflectMask(mask, n) for mask in masks])
+    best = None
+    for image in images:
+        for r in range(n):
+            candidate = sorted(rotateMask(mask, r, n) for mask in image)
+            if best is None or candidate < best:
+                best = candidate
+    return best
+
+def symmetricFingerprint(members: Iterable[Sequence[int]], n, reflection=False) -> str:
+    """Fingerprint of a collection that is unchanged by cyclic relabeling (and reflection)."""
+    return masksFingerprint(canonicalMasks(collectionMasks(members), n, reflection), n)
+
+def sameUpToSymmetry(first: Iterable[Sequence[int]], second: Iterable[Sequence[int]], n, reflection=False) -> bool:
+    """Exact check that two collections are equal up to rotation (and reflection) of [n]."""
+    a = collectionMasks(first)
+    b = collectionMasks(second)
+    if len(a) != len(b):
+        return False
+    return canonicalMasks(a, n, reflection) == canonicalMasks(b, n, reflection)
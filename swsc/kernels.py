@@ -0,0 +1,188 @@
+import os
+
+# ───────────────────────
+# Optional compiled kernels
+# ───────────────────────
+# The integer-only inner loops (the weak-separation test over pairs of subset masks in
+# FindBreakers, and the rotation loop behind orbit / orbitKey) also exist as Numba
+# kernels. The SWSC_KERNELS environment variable picks the backend:
+#
+#   auto         (default) Numba if it is installed, Python otherwise
+#   python       always the pure-Python code, which stays the reference
+#   numba        Numba, raising ImportError if it is not installed
+#   interpreted  the Numba kernel code run by the interpreter (needs numpy); for checking only
+#
+# Masks are uint64, so the weak-separation and orbitKey kernels only take n <= 64 and
+# larger n stays on the Python path. Numba is imported (and the kernels compiled) on
+# first use, so importing swsc still needs only the standard library.
+
+BACKENDS = ("auto", "python", "numba", "interpreted")
+
+# Shortest rotation loop handed to a kernel; below these the call overhead eats the gain
+MIN_ORBIT_STEPS = 8
+MIN_KEY_STEPS = 16
+
+_backend = None
+_kernels = None
+_built = {}                                     # Kernels per backend, so switching back does not recompile
+
+def _buildKernels(jit):
+    import numpy as np
+
+    ZERO = np.uint64(0)
+    ONE = np.uint64(1)
+    SHIFTS = (np.uint64(1), np.uint64(2), np.uint64(4), np.uint64(8), np.uint64(16), np.uint64(32))
+
+    @jit
+    def span(x):
+        # Mask of every bit from the lowest to the highest set bit of x (x != 0)
+        low = x & (~x + ONE)
+        high = x
+        for shift in SHIFTS:
+            high |= high >> shift
+        return high & ~(low - ONE)
+
+    @jit
+    def separated(a, b):
+        aOnly = a & ~b
+        bOnly = b & ~a
+        if aOnly == ZERO or bOnly == ZERO:
+            return True
+        return (aOnly & span(bOnly)) == ZERO or (bOnly & span(aOnly)) == ZERO
+
+    @jit
+    def rowConflicts(masks, i, out):
+        # Writes every j > i with masks[j] not weakly separated from masks[i] to out; returns how many
+        a = masks[i]
+        count = 0
+        for j in range(i + 1, masks.shape[0]):
+            if not separated(a, masks[j]):
+                out[count] = j
+                count += 1
+        return count
+
+    @jit
+    def conflictCounts(masks, counts):
+        m = masks.shape[0]
+        for i in range(m):
+            a = masks[i]
+            for j in range(i + 1, m):
+                if not separated(a, masks[j]):
+                    counts[i] += 1
+                    counts[j] += 1
+
+    @jit
+    def orbitRows(subset, l, n, steps):
+        # Rows of the orbit of the sorted subset under x -> x+l (mod n), each row sorted;
+        # stops when the rotation comes back to the start, as orbit() does
+        k = subset.shape[0]
+        out = np.empty((steps, k), dtype=np.int64)
+        out[0] = subset
+        rows = 1
+        current = subset.copy()
+        for _ in range(steps - 1):
+            for t in range(k):
+                current[t] = (current[t] + l - 1) % n + 1
+            current.sort()
+            same = True
+            for t in range(k):
+                if current[t] != out[0, t]:
+                    same = False
+                    break
+            if same:
+                break
+            out[rows] = current
+            rows += 1
+        return out[:rows]
+
+    @jit
+    def minRotation(mask, l, n, steps):
+        # Smallest of the masks reached by rotating mask by l (mod n), steps - 1 times
+        full = ~ZERO if n == 64 else (ONE << np.uint64(n)) - ONE
+        shift = np.uint64(l)
+        back = np.uint64(n - l)
+        best = mask
+        for _ in range(steps - 1):
+            mask = ((mask << shift) | (mask >> back)) & full
+            if mask < best:
+                best = mask
+        return best
+
+    return {"rowConflicts": rowConflicts, "conflictCounts": conflictCounts,
+            "orbitRows": orbitRows, "minRotation": minRotation}
+
+def setKernelBackend(name="auto"):
+    """Switch backend (one of BACKENDS) and return the one in use, "python", "numba" or "interpreted"."""
+    global _backend, _kernels
+    if name not in BACKENDS:
+        raise ValueError(f"unknown kernel backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    _kernels = None
+    if name == "python":
+        _backend = "python"
+        return _backend
+    if name == "interpreted":
+        if name not in _built:
+            _built[name] = _buildKernels(lambda f: f)
+        _kernels = _built[name]
+        _backend = "interpreted"
+        return _backend
+    try:
+        from numba import njit
+    except ImportError:
+        if name == "numba":
+            raise ImportError("numba is required for SWSC_KERNELS=numba. Run 'pip install numba'.") from None
+        _backend = "python"
+        return _backend
+    if "numba" not in _built:
+        _built["numba"] = _buildKernels(njit(cache=True))
+    _kernels = _built["numba"]
+    _backend = "numba"
+    return _backend
+
+def kernelBackend():
+    """The backend in use, resolved from SWSC_KERNELS on first call."""
+    if _backend is None:
+        setKernelBackend(os.environ.get("SWSC_KERNELS", "auto").strip().lower() or "auto")
+    return _backend
+
+def compiled():
+    """True when orbit and the weak-separation loops should go through the kernels."""
+    return kernelBackend() != "python"
+
+def masksArray(masks):
+    import numpy as np
+
+    return np.array(masks, dtype=np.uint64)
+
+def iterConflictPairs(masks):
+    """Every (i, j), i < j, whose masks (n <= 64) are not weakly separated, in order, one row at a time."""
+    import numpy as np
+
+    packed = masksArray(masks)
+    out = np.empty(len(masks), dtype=np.int64)
+    rowConflicts = _kernels["rowConflicts"]
+    for i in range(len(masks)):
+        count = rowConflicts(packed, i, out)
+        for j in out[:count].tolist():
+            yield i, j
+
+def conflictCounts(masks):
+    """Conflicts per mask (n <= 64) as a list."""
+    import numpy as np
+
+    counts = np.zeros(len(masks), dtype=np.int64)
+    _kernels["conflictCounts"](masksArray(masks), counts)
+    return counts.tolist()
+
+def orbitTuples(subset, l, n, steps):
+    """orbit(subset, l, n) from the kernel: sorted tuples, starting with sorted(subset)."""
+    import numpy as np
+
+    rows = _kernels["orbitRows"](np.array(sorted(subset), dtype=np.int64), l, n, steps)
+    return [tuple(row) for row in rows.tolist()]
+
+def minRotation(mask, l, n, steps):
+    """Smallest rotation of *mask* (n <= 64) by multiples of l, as a Python int."""
+    import numpy as np
+
+    return int(_kernels["minRotation"](np.uint64(mask), l, n, steps))
@@ -0,0 +1,192 @@
+import random
+import time
+from itertools import islice, permutations
+from math import factorial, gcd
+
+from .core import checkConds, iter_collection, iter_seeds, randomOrdering
+from .fingerprint import collectionFingerprint, sameUpToSymmetry, symmetricFingerprint
+
+# ───────────────────────
+# Ordering enumeration
+# ───────────────────────
+# A valid ordering of the l equivalence classes lists g+1..l first and 1..g last when
+# l != gcd(n, l) = g (any order inside each block), or is any permutation of 1..l
+# when l == g. iter_seeds only clears the classes of the g+1..l block, as a set, so
+# the order inside that block never changes the collection: the orderings worth
+# running keep it as l, l-1, ..., g+1 and permute only 1..g. These run Valgorithm2's
+# seed generation for many of them (all, or a random sample) and group the resulting
+# collections by fingerprint.
+
+def orderingBlocks(n, l):
+    """The blocks of classes a valid ordering permutes independently, in order."""
+    g = gcd(n, l)
+    if l != g:
+        return [list(range(l, g, -1)), list(range(g, 0, -1))]
+    return [list(range(l, 0, -1))]
+
+def _permutedBlock(n, l):
+    # The block whose order can change the collection; the classes before it stay l, ..., g+1
+    g = gcd(n, l)
+    return list(range(l, g, -1)) if l != g else [], orderingBlocks(n, l)[-1]
+
+def canonicalOrdering(n, l, ordering):
+    """*ordering* with its g+1..l block put back in the order l, ..., g+1 (same collection)."""
+    fixed, _ = _permutedBlock(n, l)
+    return fixed + list(ordering[len(fixed):])
+
+def orderingCount(n, l):
+    """Number of orderings that can give different collections: g! if l != g, else l!."""
+    _, block = _permutedBlock(n, l)
+    return factorial(len(block))
+
+def iter_orderings(n, l):
+    """Yield every ordering that can give a different collection lazily, starting with
+    the standard ordering l, l-1, ..., 1."""
+    fixed, block = _permutedBlock(n, l)
+    for part in permutations(block):
+        yield fixed + list(part)
+
+def sample_orderings(n, l, count, seed=None):
+    """Yield *count* distinct orderings from iter_orderings drawn at random (all of them if there are fewer)."""
+    rng = random.Random(seed)
+    total = orderingCount(n, l)
+    if count >= total:
+        yield from iter_orderings(n, l)
+        return
+    if 2 * count > total:                       # Dense sample: rejection would stall, pick indices instead
+        chosen = set(rng.sample(range(total), count))
+        for i, ordering in enumerate(iter_orderings(n, l)):
+            if i in chosen:
+                yield ordering
+        return
+    seen = set()
+    while len(seen) < count:
+        ordering = canonicalOrdering(n, l, randomOrdering(n, l, rng))
+        if tuple(ordering) not in seen:
+            seen.add(tuple(ordering))
+            yield ordering
+
+def orderingResult(n, k, l, ordering, symmetric=False, reflection=False):
+    """Run one ordering; returns (ordering, fingerprint, seeds, size, error).
+
+    size is the number of distinct subsets in the collection. With *symmetric* the
+    fingerprint is invariant under rotating (and with *reflection* reflecting) [n]. On an
+    exception the fingerprint, seeds and size are None and error is the message.
+    """
+    try:
+        seeds = list(iter_seeds(n, k, l, ordering))
+        members = set(iter_collection(n, k, l, ordering, seeds=seeds))
+        if symmetric:
+            fingerprint = symmetricFingerprint(members, n, reflection)
+        else:
+            fingerprint = collectionFingerprint(members, n)
+        return (ordering, fingerprint, len(seeds), len(members), None)
+    except Exception as e:
+        return (ordering, None, None, None, str(e))
+
+def _ordering_batch(n, k, l, batch, symmetric, reflection):
+    return [orderingResult(n, k, l, ordering, symmetric, reflection) for ordering in batch]
+
+def run_orderings(n, k, l, orderings, workers=1, batch=64, symmetric=False, reflection=False):
+    """Yield orderingResult for each of *orderings*, in order.
+
+    *orderings* is consumed lazily. With workers > 1 batches of *batch* orderings go to
+    a process pool, with at most a few batches per worker in flight at a time.
+    """
+    orderings = iter(orderings)
+    if workers <= 1:
+        for ordering in orderings:
+            yield orderingResult(n, k, l, ordering, symmetric, reflection)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    inFlight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(inFlight) < 4 * workers:
+                chunk = list(islice(orderings, batch))
+                if not chunk:
+                    break
+                inFlight.append(executor.submit(_ordering_batch, n, k, l, chunk, symmetric, reflection))
+            if not inFlight:
+                return
+            yield from inFlight.popleft().result()
+
+def explore_orderings(n, k, l, orderings="all", workers=1, seed=None, verbose=True, batch=64,
+                      symmetric=False, reflection=False, confirm=False):
+    """Generate the collection for every ordering that can give a different one
+    (``orderings="all"``, see iter_orderings) or for a random sample of *orderings*
+    distinct ones, and group the collections by fingerprint.
+
+    With *symmetric* collections that differ by a rotation of [n] (and with *reflection*
+    a reflection) count as the same. With *confirm* every repeated fingerprint is checked
+    exactly by regenerating both collections; a mismatch is listed under "collisions".
+
+    Returns a dict with the number of orderings run, the number of distinct collections,
+    for each fingerprint the first ordering that produced it, how many did and the
+    collection size, the orderings that raised, and the elapsed time and throughput.
+    """
+    if not checkConds(n, k, l, verbose):
+        print(f"Invalid parameters: n={n}, k={k}, l={l}. Check conditions.")
+        return None
+
+    total = orderingCount(n, l)
+    if orderings == "all":
+        source = iter_orderings(n, l)
+        planned = total
+    else:
+        source = sample_orderings(n, l, int(orderings), seed)
+        planned = min(int(orderings), total)
+    if verbose:
+        print(f"Running {planned} of {total} distinct ordering(s) for n={n}, k={k}, l={l} on {workers} worker(s).")
+
+    expected = k * (n - k) + 1
+    collections = {}
+    errors = []
+    collisions = []
+    count = 0
+
+    def sameCollection(first, second):
+        a = set(iter_collection(n, k, l, first))
+        b = set(iter_collection(n, k, l, second))
+        return sameUpToSymmetry(a, b, n, reflection) if symmetric else a == b
+
+    start = time.perf_counter()
+    for ordering, fingerprint, seeds, size, error in run_orderings(n, k, l, source, workers, batch,
+                                                                   symmetric, reflection):
+        count += 1
+        if error is not None:
+            errors.append((ordering, error))
+            continue
+        entry = collections.get(fingerprint)
+        if entry is None:
+            collections[fingerprint] = {"ordering": ordering, "count": 1, "seeds": seeds, "size": size}
+        elif confirm and not sameCollection(entry["ordering"], ordering):
+            collisions.append((entry["ordering"], ordering))
+        else:
+            entry["count"] += 1
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "n": n, "k": k, "l": l,
+        "orderings": count,
+        "distinct": len(collections),
+        "collections": collections,
+        "errors": errors,
+        "collisions": collisions,
+        "elapsed_seconds": elapsed,
+        "orderings_per_second": count / elapsed if elapsed else float("inf"),
+    }
+    if verbose:
+        wrongSize = sum(1 for entry in collections.values() if entry["size"] != expected)
+        print(f"{count} ordering(s) → {len(collections)} distinct collection(s)"
+              f" in {elapsed:.2f} s ({summary['orderings_per_second']:.1f} orderings/s).")
+        if wrongSize:
+            print(f"{wrongSize} distinct collection(s) do not have {expected} subsets.")
+        if collisions:
+            print(f"{len(collisions)} fingerprint collision(s) failed the exact check.")
+        if errors:
+            print(f"{len(errors)} ordering(s) raised, first: {errors[0][0]} → {errors[0][1]}")
+    return summary
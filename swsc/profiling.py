@@ -0,0 +1,47 @@
+import json
+from time import perf_counter
+
+# ───────────────────────
+# Per-phase timing for Valgorithm2
+# ───────────────────────
+# Phases recorded by iter_seeds / Valgorithm2:
+#   prune        removing the classes before startAt (ordering[0:l-g])
+#   classes      walking a's equivalence class at the start and end of each bucket
+#   consecutive  locating a among the available terms (the windows are made lazily during removal)
+#   removal      the left/right removal loop, including orbitKey deduplication
+#   remap        mapping seeds back through fixMap when l != gcd(n, l)
+#   print        printing / copying / saving the seeds and the collection
+# Iterations count loop steps: classes walked, windows built, removal steps, seeds remapped.
+
+class PhaseProfile:
+    """Accumulates wall time and iteration counts per phase, overall and per bucket a.
+
+    Pass one as ``profile=`` to :func:`Valgorithm2` or :func:`iter_seeds`; with the default
+    ``profile=None`` nothing is timed. When iter_seeds is consumed lazily the removal time
+    also includes whatever the consumer does between seeds.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.buckets = {}
+
+    def add(self, phase, seconds, iterations=0, bucket=None):
+        for table in (self.phases, self.buckets.setdefault(bucket, {}) if bucket is not None else None):
+            if table is None:
+                continue
+            entry = table.setdefault(phase, {"seconds": 0.0, "iterations": 0})
+            entry["seconds"] += seconds
+            entry["iterations"] += iterations
+
+    def asDict(self):
+        return {
+            "total_seconds": sum(entry["seconds"] for entry in self.phases.values()),
+            "phases": self.phases,
+            "buckets": {str(a): phases for a, phases in self.buckets.items()},
+        }
+
+    def toJSON(self, **kwargs):
+        return json.dumps(self.asDict(), **kwargs)
+
+    def clock(self):
+        return perf_counter()
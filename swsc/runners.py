@@ -0,0 +1,106 @@
+import random
+
+from .core import Valgorithm2, checkConds, orbit
+from .profiling import PhaseProfile
+
+# ───────────────────────
+# Runners
+# ───────────────────────
+def reportProfile(profile):
+    """Print the per-phase timings as JSON and return them as a dict."""
+    print(profile.toJSON(indent=2))
+    return profile.asDict()
+
+def _phaseProfile(profile):
+    # profile may be False/True or a PhaseProfile the caller reads afterwards
+    if isinstance(profile, PhaseProfile):
+        return profile
+    return PhaseProfile() if profile else None
+
+def runAlgorithm(n, k, l, override=[], printSeeds=True, printCollection=True, savePath=None, profile=False,
+                 cache=None, rngSeed=None):
+    """Run the Valgorithm2 algorithm with the given parameters and return the seeds.
+
+    If *savePath* is given the collection is also written there as a binary collection file.
+    With *profile* (True, or a :class:`~swsc.profiling.PhaseProfile` to fill in) the per-phase
+    timings are also printed as JSON; the seeds are returned either way. *cache* and *rngSeed*
+    are passed on to :func:`Valgorithm2`.
+    """
+    if(checkConds(n, k, l, True)):
+        phases = _phaseProfile(profile)
+        seeds=Valgorithm2(n,k,l,printSeeds=printSeeds, printCollection=printCollection, stOrder=False,override=override,
+                          savePath=savePath, profile=phases, cache=cache, rngSeed=rngSeed)
+        unique_subsets = set()
+        for seed in seeds:
+            unique_subsets.update(orbit(seed, l, n, verbose=False))
+
+        expected = k * (n - k) + 1
+        found  = len(unique_subsets)
+        print(found)
+        print(expected)
+        if phases is not None:
+            reportProfile(phases)
+        return seeds
+    else:
+        print(f"Invalid parameters: n={n}, k={k}, l={l}. Check conditions.")
+
+def runAlgorithmFull(n, k, l, override=[], useStandardOrdering=True, printSeeds=True,
+                     copyCollectionToClipboard=False, printCollection=True,
+                     testing=False, nStart=7, nTo=20, randomTrial=False, supPass=False, workers=1,
+                     store=None, resume=False, savePath=None, profile=False, orderings=None,
+                     orderingSeed=None, fingerprint=False, reflection=False, cache=None, rngSeed=None,
+                     complements=False):
+    phases = _phaseProfile(profile)
+    if orderings is not None:
+        from .orderings import explore_orderings
+
+        # Every valid ordering ("all") or a random sample of that many, grouped by collection
+        return explore_orderings(n, k, l, orderings, workers=workers, seed=orderingSeed,
+                                 symmetric=fingerprint or reflection, reflection=reflection)
+    if testing:
+        from .sweep import test_valgorithm2_up_to
+
+        test_valgorithm2_up_to(nStart, nTo, quiet_valgo=True, verbose=True, supPass=supPass, workers=workers,
+                               store=store, resume=resume, fingerprint=fingerprint or reflection,
+                               reflection=reflection, complements=complements)
+    elif randomTrial:
+        ogN = n
+        conds = False
+        while not conds:
+            n = random.randint(4,ogN)
+            l=random.randint(2,n-2)
+            k=random.randint(2,n//2)
+            conds = checkConds(n,k,l, False)
+        print(f"We are going with n={n}, k={k}, l={l}.")
+        seeds=Valgorithm2(n,k,l,printSeeds=printSeeds, stOrder=useStandardOrdering, override=override, copyToClipboard=copyCollectionToClipboard,
+                         printCollection=printCollection, savePath=savePath, profile=phases, cache=cache,
+                         rngSeed=rngSeed)
+        unique_subsets = set()
+        for seed in seeds:
+            unique_subsets.update(orbit(seed, l, n, verbose=False))
+
+        expected = k * (n - k) + 1
+        found    = len(unique_subsets)
+        print(found)
+        print(expected)
+        if phases is not None:
+            reportProfile(phases)
+        return seeds
+    else:
+        if(checkConds(n, k, l, True)):
+            seeds=Valgorithm2(n,k,l,printSeeds=printSeeds, stOrder=useStandardOrdering, override=override, copyToClipboard=copyCollectionToClipboard,
+                         printCollection=printCollection, savePath=savePath, profile=phases, cache=cache,
+                         rngSeed=rngSeed)
+            unique_subsets = set()
+            for seed in seeds:
+                unique_subsets.update(orbit(seed, l, n, verbose=False))
+
+            expected = k * (n - k) + 1
+            found  = len(unique_subsets)
+            print(found)
+            print(expected)
+            if phases is not None:
+                reportProfile(phases)
+            return seeds
+        else:
+            print(f"Invalid parameters: n={n}, k={k}, l={l}. Check conditions.")
@@ -0,0 +1,236 @@
+import ast
+import io
+import sys
+
+from .core import Valgorithm2, checkConds, iter_collection, orbit, randomOrdering
+from .fingerprint import sameUpToSymmetry, symmetricFingerprint
+
+# ---------------------------------------------------------------------------
+# Tester
+# ---------------------------------------------------------------------------
+def sweep_triples(startN, max_n, complements=False):
+    """Every (n, k, l) with startN <= n <= max_n that passes checkConds, in sweep order.
+
+    k > n/2 triples are complements of the n-k run (see complementSeeds) and roughly
+    double the sweep, so they are only included with *complements*.
+    """
+    for n in range(startN, max_n + 1):
+        for k in range(2, (n - 1) if complements else (n // 2 + 1)):
+            for l in range(2, n-1):
+                if checkConds(n, k, l, False):
+                    yield (n, k, l)
+
+def fingerprintMode(reflection):
+    return "dihedral" if reflection else "cyclic"
+
+def check_triple(n, k, l, quiet_valgo=True, fingerprint=False, reflection=False):
+    """Run Valgorithm2 on one triple with a random ordering and count the collection it generates.
+
+    Returns (n, k, l, expected, found, ordering, fingerprint), with expected = "exception"
+    and found = the message if it raised. fingerprint is None unless *fingerprint* is set,
+    then it is the collection's symmetricFingerprint prefixed with the symmetry used
+    ("cyclic:" or, with *reflection*, "dihedral:"). Module level so that worker
+    processes can run it.
+    """
+    import contextlib
+
+    ordering = randomOrdering(n, l)
+    try:
+        with (contextlib.redirect_stdout(io.StringIO()) if quiet_valgo else contextlib.nullcontext()):
+            seeds = Valgorithm2(n, k, l, printCollection=not quiet_valgo,printSeeds=not quiet_valgo, stOrder=False,
+                                override=ordering)
+
+        # independently rebuild the collection
+        unique_subsets = set()
+        for seed in seeds:
+            unique_subsets.update(orbit(seed, l, n, verbose=False))
+
+        key = None
+        if fingerprint:
+            key = f"{fingerprintMode(reflection)}:{symmetricFingerprint(unique_subsets, n, reflection)}"
+        return (n, k, l, k * (n - k) + 1, len(unique_subsets), ordering, key)
+    except Exception as e:
+        return (n, k, l, "exception", str(e), ordering, None)
+
+def run_sweep(triples, quiet_valgo=True, workers=1, fingerprint=False, reflection=False, ordered=True):
+    """Yield check_triple results in the order of *triples*, or with ordered=False in the
+    order they finish.
+
+    With workers > 1 the triples go to a process pool in sweep order and the pool
+    hands each free worker the next one, so results (and the ordered report built
+    from them) keep coming while the sweep runs.
+    """
+    triples = list(triples)
+    if workers <= 1:
+        for n, k, l in triples:
+            yield check_triple(n, k, l, quiet_valgo, fingerprint, reflection)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(check_triple, n, k, l, quiet_valgo, fingerprint, reflection)
+                   for n, k, l in triples]
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+        except BaseException:                   # Ctrl-C or an abandoned generator: drop the queued cases
+            for future in futures:
+                future.cancel()
+            raise
+
+# ---------------------------------------------------------------------------
+# Sweep result store (SQLite), so an interrupted sweep can be resumed
+# ---------------------------------------------------------------------------
+def algorithmVersion():
+    """Hash of the full source of swsc.core and swsc.kernels, which decide every result.
+
+    Whole modules rather than a list of functions, so editing any helper the generator
+    uses (the bitmask helpers, classTables, the kernels) changes the version too.
+    """
+    import hashlib, inspect
+    from . import core, kernels
+
+    source = "".join(inspect.getsource(module) for module in (core, kernels))
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+def openSweepStore(path):
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE IF NOT EXISTS sweep_results (
+                        version TEXT, n INTEGER, k INTEGER, l INTEGER, ordering TEXT,
+                        expected INTEGER, found INTEGER, error TEXT, fingerprint TEXT,
+                        PRIMARY KEY (version, n, k, l, ordering))""")
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(sweep_results)")]
+    if "fingerprint" not in columns:           # Stores written before fingerprints were recorded
+        conn.execute("ALTER TABLE sweep_results ADD COLUMN fingerprint TEXT")
+    conn.commit()
+    return conn
+
+def recordSweepResult(conn, version, result):
+    n, k, l, expected, found, ordering, fingerprint = result
+    if expected == "exception":
+        row = (version, n, k, l, str(ordering), None, None, found, None)
+    else:
+        row = (version, n, k, l, str(ordering), expected, found, None, fingerprint)
+    conn.execute("INSERT OR REPLACE INTO sweep_results "
+                 "(version, n, k, l, ordering, expected, found, error, fingerprint) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+    conn.commit()                               # Commit every row so Ctrl-C loses at most the case in flight
+
+def recordedSweepResults(conn, version):
+    """{(n, k, l): result} for every triple already recorded for this algorithm version."""
+    recorded = {}
+    for n, k, l, ordering, expected, found, error, fingerprint in conn.execute(
+            "SELECT n, k, l, ordering, expected, found, error, fingerprint FROM sweep_results WHERE version = ? "
+            "ORDER BY fingerprint IS NOT NULL", (version,)):     # A fingerprinted row wins over an older one
+        if error is not None:
+            recorded[(n, k, l)] = (n, k, l, "exception", error, ast.literal_eval(ordering), None)
+        else:
+            recorded[(n, k, l)] = (n, k, l, expected, found, ast.literal_eval(ordering), fingerprint)
+    return recorded
+
+def test_valgorithm2_up_to(startN, max_n: int, *, quiet_valgo: bool = True,
+                           verbose: bool = False, supPass=False, workers: int = 1,
+                           store=None, resume=False, fingerprint=False, reflection=False,
+                           complements=False) -> None:
+    """Sweep every valid triple up to max_n. With *store* (an SQLite path) each result
+    is recorded as soon as it finishes, whichever worker ran it, and the report still
+    follows sweep order; with *resume* triples already recorded for the current
+    algorithmVersion() are reported from the store instead of being recomputed.
+
+    With *fingerprint* each collection gets a rotation (and with *reflection* reflection)
+    invariant fingerprint, and triples with the same n and k whose collections share one
+    are confirmed exactly and reported as duplicates at the end. With *complements* the
+    k > n/2 triples are swept too."""
+
+    # ANSI escape helpers ---------------------------------------------------
+    GREEN  = "\033[92m"
+    RED    = "\033[91m"
+    YELLOW = "\033[93m"
+    RESET  = "\033[0m"
+
+    def colour(txt: str, clr: str) -> str:
+        return f"{clr}{txt}{RESET}" if sys.stdout.isatty() else txt
+
+    # -----------------------------------------------------------------------
+    triples = list(sweep_triples(startN, max_n, complements))
+    conn = openSweepStore(store) if store else None
+    version = algorithmVersion() if store else None
+    recorded = recordedSweepResults(conn, version) if store and resume else {}
+    if fingerprint:                             # Rerun recorded cases without a fingerprint of this kind
+        mode = fingerprintMode(reflection) + ":"
+        recorded = {t: r for t, r in recorded.items()
+                    if r[3] == "exception" or (r[6] or "").startswith(mode)}
+    if recorded:
+        print(f"Resuming: {sum(t in recorded for t in triples)} of {len(triples)} case(s) already recorded.")
+    fresh = run_sweep([t for t in triples if t not in recorded], quiet_valgo, workers, fingerprint, reflection,
+                      ordered=False)
+    arrived = {}
+
+    def inSweepOrder():
+        # Fresh results are recorded the moment they finish and held until their turn in the report
+        for triple in triples:
+            if triple in recorded:
+                yield recorded[triple]
+                continue
+            while triple not in arrived:
+                result = next(fresh)
+                if conn is not None:
+                    recordSweepResult(conn, version, result)
+                arrived[result[:3]] = result
+            yield arrived.pop(triple)
+
+    failures: list[tuple] = []
+    firstWithFingerprint = {}                   # (n, k, fingerprint) -> (l, ordering) of the first triple
+    duplicates: list[tuple] = []
+    counter = 0
+    try:
+        for result in inSweepOrder():
+            n, k, l, expected, found, ordering, key = result
+            counter+=1
+            if expected == "exception":
+                failures.append((n, k, l, "exception", found))
+                if verbose:
+                    status = colour("! ERROR", YELLOW)
+                    print(f"{status} n={n:2d}, k={k:2d}, l={l:2d} → {found}")
+                continue
+
+            passed   = (found == expected)
+
+            if verbose:
+                if passed:
+                    if not supPass:
+                        status = colour("✓ PASS ", GREEN)
+                        print(f"{status} n={n:2d}, k={k:2d}, l={l:2d} → {found:3d} / {expected}")
+                else:
+                    status = colour("✗ FAIL ", RED)
+                    print(f"{status} n={n:2d}, k={k:2d}, l={l:2d} → {found:3d} / {expected}")
+
+            if not passed:
+                failures.append((n, k, l, expected, found))
+
+            if key is not None:
+                first = firstWithFingerprint.setdefault((n, k, key), (l, ordering))
+                if first != (l, ordering):
+                    firstL, firstOrdering = first
+                    if sameUpToSymmetry(iter_collection(n, k, firstL, firstOrdering),
+                                        iter_collection(n, k, l, ordering), n, reflection):
+                        duplicates.append((n, k, firstL, firstOrdering, l, ordering))
+    finally:
+        fresh.close()                           # Cancels the queued cases if the sweep is interrupted
+        if conn is not None:
+            conn.close()
+
+    # -----------------------------------------------------------------------
+    if duplicates:
+        symmetry = "rotation and reflection" if reflection else "rotation"
+        print(f"\n{len(duplicates)} collection(s) equal to an earlier one up to {symmetry}:")
+        for n, k, firstL, firstOrdering, l, ordering in duplicates:
+            print(f"  n={n:2d}, k={k:2d}: l={l} {ordering} ≡ l={firstL} {firstOrdering}")
+    if failures:
+        print(f"\n❌ {len(failures)} failure(s) found up to n = {max_n}. Total cases = {counter}\n")
+    else:
+        print(colour(f"\n✔ All tests passed for every valid (n, k, l) triple with n ≤ {max_n}",
+                     GREEN))